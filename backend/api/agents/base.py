@@ -18,7 +18,7 @@ class BaseAgent(ABC):
         pass
     
     @abstractmethod
-    async def validate(self, data: Dict[str, Any]) -> bool:
+    def validate(self, data: Dict[str, Any]) -> bool:
         """
         Validate the input data.
         
@@ -31,7 +31,7 @@ class BaseAgent(ABC):
         pass
     
     @abstractmethod
-    async def get_metadata(self) -> Dict[str, Any]:
+    def get_metadata(self) -> Dict[str, Any]:
         """
         Get metadata about the agent.
         
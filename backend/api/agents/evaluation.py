@@ -14,7 +14,7 @@ class EvaluationAgent(BaseAgent):
         Returns:
             Dict containing evaluation metrics and results
         """
-        if not await self.validate(data):
+        if not self.validate(data):
             return {"error": "Invalid evaluation data"}
         
         # Mock evaluation metrics
@@ -31,7 +31,7 @@ class EvaluationAgent(BaseAgent):
             "timestamp": datetime.now().isoformat()
         }
     
-    async def validate(self, data: Dict[str, Any]) -> bool:
+    def validate(self, data: Dict[str, Any]) -> bool:
         """
         Validate evaluation data.
         
@@ -44,7 +44,7 @@ class EvaluationAgent(BaseAgent):
         required_fields = ["model_output", "ground_truth"]
         return all(field in data for field in required_fields)
     
-    async def get_metadata(self) -> Dict[str, Any]:
+    def get_metadata(self) -> Dict[str, Any]:
         """
         Get metadata about the evaluation agent.
         
@@ -1,94 +1,278 @@
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Callable, Iterator, Iterable, FrozenSet, Tuple, Union, BinaryIO
+from sqlalchemy.orm import Session
 from abc import ABC, abstractmethod
 from .base import BaseAgent
-import json
+import asyncio
 import re
+import threading
+import ijson
+import orjson
+from bisect import bisect_left
+from collections import deque
+from functools import cached_property
 from datetime import datetime, timedelta
 import logging
 from ..models import TraceData, IssueCreate
-from ..models.database import SessionLocal, Issue, Trace, User
-from ..services.notification import NotificationService
+from ..models.database import SessionLocal, AuditLog, Issue, Trace, User
 from ..services.audit import AuditService
-from api.services.external_notification import ExternalNotificationService
 import os
 
+if TYPE_CHECKING:
+    from api.services.external_notification import ExternalNotificationService
+
+try:
+    import hyperscan
+except ImportError:  # Optional: multi-pattern DFA engine, falls back to re
+    hyperscan = None
+
+try:
+    import re2
+except ImportError:  # Optional: linear-time engine for the correlation rules, falls back to re
+    re2 = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional: literal prescreen that lets clean content skip the regex scan
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Higher rank wins when rules overlap or duplicate issues are merged
+SEVERITY_RANK = {"info": 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
+
+# Most recent values kept per performance baseline
+BASELINE_MAX_VALUES = 1024
+
+def _string_leaves(obj: Any) -> Iterator[str]:
+    """
+    Yield the scalar values of a JSON-like structure as text, depth first.
+    
+    Keys, booleans and nulls are skipped; numbers are kept so status codes
+    such as 404 or 503 stored as integers are still visible to the rules.
+    """
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _string_leaves(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            yield from _string_leaves(item)
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        yield str(obj)
+
+# Predefined RCA rules; static, so compiled once at import and shared by all agents
+_RULES = {
+    "error_patterns": [
+        {"pattern": r"ERROR|Exception|Failed|Timeout|Warning", "severity": "high"},
+        {"pattern": r"Connection refused|Connection reset|Connection timeout", "severity": "high"},
+        {"pattern": r"Out of memory|Stack overflow|Buffer overflow", "severity": "critical"},
+        {"pattern": r"Deadlock|Race condition|Thread starvation", "severity": "high"},
+        {"pattern": r"Invalid input|Validation failed|Format error", "severity": "medium"},
+        {"pattern": r"Resource not found|File not found|404", "severity": "medium"},
+        {"pattern": r"Permission denied|Access denied|403", "severity": "high"},
+        {"pattern": r"Rate limit exceeded|Throttling|429", "severity": "medium"},
+        {"pattern": r"Service unavailable|503", "severity": "high"},
+        {"pattern": r"Bad gateway|502", "severity": "high"},
+        {"pattern": r"CircuitBreakerOpen|RateLimitExceeded|Throttling", "severity": "high", "category": "resilience"},
+        {"pattern": r"Deadlock|RaceCondition|ThreadStarvation", "severity": "critical", "category": "concurrency"},
+        {"pattern": r"MemoryLeak|ResourceLeak|HandleLeak", "severity": "critical", "category": "resource"},
+        {"pattern": r"SecurityException|AccessDenied|Unauthorized", "severity": "high", "category": "security"},
+        {"pattern": r"ValidationError|SchemaError|FormatError", "severity": "medium", "category": "validation"}
+    ],
+    "performance_thresholds": {
+        "response_time": 1000,  # ms
+        "error_rate": 0.01,     # 1%
+        "throughput": 100,      # req/s
+        "cpu_usage": 80,        # %
+        "memory_usage": 80,     # %
+        "disk_usage": 80,       # %
+        "network_latency": 100,  # ms
+        "p95_latency": 2000,    # ms
+        "p99_latency": 5000,    # ms
+        "concurrent_users": 1000,
+        "queue_length": 100,
+        "retry_rate": 0.1,      # 10%
+        "timeout_rate": 0.05    # 5%
+    },
+    "correlation_rules": {
+        "error_chain": {
+            "pattern": r"caused by|at .*\.java:\d+|at .*\.py:\d+",
+            "group_by": "stack_trace"
+        },
+        "performance_degradation": {
+            "pattern": r"slow|latency|timeout|delay",
+            "group_by": "endpoint"
+        },
+        "temporal_correlation": {
+            "pattern": r"within \d+ (ms|s|m|h)",
+            "group_by": "time_window"
+        },
+        "service_dependency": {
+            "pattern": r"calling|invoking|requesting",
+            "group_by": "service_name"
+        },
+        "resource_correlation": {
+            "pattern": r"CPU|Memory|Disk|Network",
+            "group_by": "resource_type"
+        }
+    },
+    "trend_analysis": {
+        "window_size": 3600,  # 1 hour in seconds
+        "min_data_points": 10,
+        "threshold_change": 0.2  # 20% change threshold
+    }
+}
+
+def _fuse_patterns(rules_by_group: Dict[str, Dict[str, Any]], lowercase: bool = False) -> re.Pattern:
+    """
+    Compile rules into a single case-insensitive pattern with one named group per rule.
+    
+    A leading lookahead over the alternation of all rules finds the offsets where
+    any rule matches; each rule then gets its own optional lookahead, so every
+    rule matching at that offset captures its group, not just the first. Nothing
+    is consumed, so hits that overlap at different offsets are all found too.
+    The pattern is compiled as bytes so content can be scanned as UTF-8.
+    With lowercase, the pattern itself is lowercased and compiled without
+    IGNORECASE, for scanning content that has been lowercased; only safe
+    for rules made of plain literals.
+    """
+    patterns = {
+        group: rule["pattern"].lower() if lowercase else rule["pattern"]
+        for group, rule in rules_by_group.items()
+    }
+    pattern = "(?=" + "|".join(f"(?:{p})" for p in patterns.values()) + ")" + "".join(
+        f"(?:(?=(?P<{group}>{p})))?" for group, p in patterns.items()
+    )
+    return re.compile(pattern.encode(), 0 if lowercase else re.IGNORECASE)
+
+def _build_hyperscan_db(rules: List[Dict[str, Any]]) -> "hyperscan.Database":
+    """Compile rules into a Hyperscan block-mode database; ids index into rules."""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[rule["pattern"].encode() for rule in rules],
+        ids=list(range(len(rules))),
+        elements=len(rules),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SOM_LEFTMOST] * len(rules)
+    )
+    return db
+
+def _literal_alternatives(rules: List[Dict[str, Any]]) -> Optional[Tuple[bytes, ...]]:
+    """
+    Return the lowercased literal alternatives of rules as bytes.
+    
+    Returns None when any alternative is a real regex, since literals alone
+    could then miss a hit.
+    """
+    literals = [literal for rule in rules for literal in rule["pattern"].split("|")]
+    if not all(re.fullmatch(r"[A-Za-z0-9 ]+", literal) for literal in literals):
+        return None
+    return tuple(dict.fromkeys(literal.lower().encode() for literal in literals))
+
+def _build_literal_prescreen(literals: Tuple[bytes, ...]) -> "ahocorasick.Automaton":
+    """Build an Aho-Corasick automaton over lowercased literals."""
+    automaton = ahocorasick.Automaton()
+    for literal in literals:
+        automaton.add_word(literal.decode(), literal)
+    automaton.make_automaton()
+    return automaton
+
+def _compile_correlation_pattern(pattern: str) -> Any:
+    """
+    Compile a correlation pattern for case-insensitive bytes matching.
+    
+    RE2 is preferred when installed: patterns such as "at .*\\.py:\\d+" backtrack
+    quadratically in re on long lines that contain many "at " but no match.
+    """
+    if re2 is not None:
+        return re2.compile(b"(?i)" + pattern.encode())
+    return re.compile(pattern.encode(), re.IGNORECASE)
+
+# Error rules are fused into one pattern so content is scanned once.
+# They are ordered most severe first, which is the order in which rules
+# that match at the same offset are reported.
+_ERROR_RULES = {
+    f"p{i}": rule
+    for i, rule in enumerate(sorted(
+        _RULES["error_patterns"],
+        key=lambda rule: SEVERITY_RANK[rule["severity"]],
+        reverse=True
+    ))
+}
+_HS_ERROR_DB = _build_hyperscan_db(list(_ERROR_RULES.values())) if hyperscan else None
+# Hyperscan already prefilters on literals, so the prescreen only fronts re
+_ERROR_LITERALS = None if hyperscan else _literal_alternatives(list(_ERROR_RULES.values()))
+# Literal-only rules are matched against lowercased content, which is cheaper
+# than case folding inside the regex engine
+_FUSED_ERROR_RE = _fuse_patterns(_ERROR_RULES, lowercase=_ERROR_LITERALS is not None)
+_ERROR_PRESCREEN = _build_literal_prescreen(_ERROR_LITERALS) if ahocorasick and _ERROR_LITERALS else None
+# Correlation rules contain unbounded patterns (e.g. "at .*\.py") that would
+# swallow other rules' matches inside an alternation, so they stay separate.
+_CORRELATION_RULES = tuple(
+    (rule_name, _compile_correlation_pattern(rule["pattern"]), rule)
+    for rule_name, rule in _RULES["correlation_rules"].items()
+)
+# Field extractors applied to correlation hits
+_TIME_WINDOW_RE = re.compile(r"within (\d+ (ms|s|m|h))")
+_SERVICE_NAME_RE = re.compile(r"(calling|invoking|requesting) (\w+)")
+_RESOURCE_TYPE_RE = re.compile(r"(CPU|Memory|Disk|Network)")
+
 class RCAAgent(BaseAgent):
     """Root Cause Analysis agent for analyzing traces and detecting issues."""
     
-    def __init__(self, llm_client=None):
+    def __init__(self, llm_client=None, db_factory: Callable[..., Session] = SessionLocal):
         self.llm_client = llm_client
-        self.rules = self._load_rules()
-        self.notification_service = NotificationService(SessionLocal())
-        self.audit_service = AuditService(SessionLocal())
+        # Sessions are opened per unit of work from this factory, so a long-lived
+        # agent never holds on to a stale connection
+        self.db_factory = db_factory
+        self.rules = _RULES
+        self._performance_thresholds = _RULES["performance_thresholds"]
+        self._error_rules = _ERROR_RULES
+        self._fused_error_re = _FUSED_ERROR_RE
+        self._hs_error_db = _HS_ERROR_DB
+        self._error_literals = _ERROR_LITERALS
+        self._error_prescreen = _ERROR_PRESCREEN
+        self._correlation_rules = _CORRELATION_RULES
         self.baselines = {}  # Store performance baselines
-        self.external_notification = ExternalNotificationService()
-        logger.info("RCA Agent initialized with audit service and external notification service")
+        # Steps are analyzed in worker threads, so concurrent traces would
+        # otherwise interleave updates to a baseline's values and running sum
+        self._baselines_lock = threading.Lock()
+        logger.info("RCA Agent initialized")
     
-    def _load_rules(self) -> Dict[str, Any]:
-        """Load predefined rules for RCA."""
-        return {
-            "error_patterns": [
-                {"pattern": r"ERROR|Exception|Failed|Timeout|Warning", "severity": "high"},
-                {"pattern": r"Connection refused|Connection reset|Connection timeout", "severity": "high"},
-                {"pattern": r"Out of memory|Stack overflow|Buffer overflow", "severity": "critical"},
-                {"pattern": r"Deadlock|Race condition|Thread starvation", "severity": "high"},
-                {"pattern": r"Invalid input|Validation failed|Format error", "severity": "medium"},
-                {"pattern": r"Resource not found|File not found|404", "severity": "medium"},
-                {"pattern": r"Permission denied|Access denied|403", "severity": "high"},
-                {"pattern": r"Rate limit exceeded|Throttling|429", "severity": "medium"},
-                {"pattern": r"Service unavailable|503", "severity": "high"},
-                {"pattern": r"Bad gateway|502", "severity": "high"},
-                {"pattern": r"CircuitBreakerOpen|RateLimitExceeded|Throttling", "severity": "high", "category": "resilience"},
-                {"pattern": r"Deadlock|RaceCondition|ThreadStarvation", "severity": "critical", "category": "concurrency"},
-                {"pattern": r"MemoryLeak|ResourceLeak|HandleLeak", "severity": "critical", "category": "resource"},
-                {"pattern": r"SecurityException|AccessDenied|Unauthorized", "severity": "high", "category": "security"},
-                {"pattern": r"ValidationError|SchemaError|FormatError", "severity": "medium", "category": "validation"}
-            ],
-            "performance_thresholds": {
-                "response_time": 1000,  # ms
-                "error_rate": 0.01,     # 1%
-                "throughput": 100,      # req/s
-                "cpu_usage": 80,        # %
-                "memory_usage": 80,     # %
-                "disk_usage": 80,       # %
-                "network_latency": 100,  # ms
-                "p95_latency": 2000,    # ms
-                "p99_latency": 5000,    # ms
-                "concurrent_users": 1000,
-                "queue_length": 100,
-                "retry_rate": 0.1,      # 10%
-                "timeout_rate": 0.05    # 5%
-            },
-            "correlation_rules": {
-                "error_chain": {
-                    "pattern": r"caused by|at .*\.java:\d+|at .*\.py:\d+",
-                    "group_by": "stack_trace"
-                },
-                "performance_degradation": {
-                    "pattern": r"slow|latency|timeout|delay",
-                    "group_by": "endpoint"
-                },
-                "temporal_correlation": {
-                    "pattern": r"within \d+ (ms|s|m|h)",
-                    "group_by": "time_window"
-                },
-                "service_dependency": {
-                    "pattern": r"calling|invoking|requesting",
-                    "group_by": "service_name"
-                },
-                "resource_correlation": {
-                    "pattern": r"CPU|Memory|Disk|Network",
-                    "group_by": "resource_type"
-                }
-            },
-            "trend_analysis": {
-                "window_size": 3600,  # 1 hour in seconds
-                "min_data_points": 10,
-                "threshold_change": 0.2  # 20% change threshold
-            }
-        }
+    async def _log_system_action(self, **kwargs) -> Optional[AuditLog]:
+        """Record a system audit log entry through AuditService in a session of its own."""
+        with self.db_factory(expire_on_commit=False) as db:
+            return await AuditService(db).log_system_action(**kwargs)
+    
+    async def _log_action(self, **kwargs) -> Optional[AuditLog]:
+        """Record a user audit log entry through AuditService in a session of its own."""
+        with self.db_factory(expire_on_commit=False) as db:
+            return await AuditService(db).log_action(**kwargs)
+    
+    @cached_property
+    def external_notification(self) -> "ExternalNotificationService":
+        """External notification service, created on first use."""
+        # Imported here: it pulls in slack_sdk, which agents that never notify don't need
+        from api.services.external_notification import ExternalNotificationService
+        return ExternalNotificationService()
+    
+    def _iter_error_hits(self, content: bytes) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (byte offset, rule) for every error pattern hit, in offset order."""
+        if self._hs_error_db is not None:
+            hits = set()
+            
+            def on_match(rule_id, start, end, flags, context):
+                hits.add((start, rule_id))
+            
+            self._hs_error_db.scan(content, match_event_handler=on_match)
+            for start, rule_id in sorted(hits):
+                yield start, self._error_rules[f"p{rule_id}"]
+            return
+        
+        for match in self._fused_error_re.finditer(content):
+            for group, text in match.groupdict().items():
+                if text is not None:
+                    yield match.start(), self._error_rules[group]
     
     async def process(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -100,10 +284,12 @@ class RCAAgent(BaseAgent):
         Returns:
             Dict containing analysis results and detected issues
         """
+        # One timestamp for everything detected in this run
+        analysis_timestamp = datetime.now().isoformat()
         try:
             logger.info(f"Starting trace analysis for trace {data.get('id')}")
             # Log start of analysis
-            audit_log = await self.audit_service.log_system_action(
+            audit_log = await self._log_system_action(
                 action_type="trace_analysis_start",
                 resource_type="trace",
                 meta_data={
@@ -114,9 +300,9 @@ class RCAAgent(BaseAgent):
             )
             logger.info(f"Audit log created for trace analysis start: {audit_log.id if audit_log else 'None'}")
             
-            if not await self.validate(data):
+            if not self.validate(data):
                 logger.warning(f"Invalid trace data for trace {data.get('id')}")
-                audit_log = await self.audit_service.log_system_action(
+                audit_log = await self._log_system_action(
                     action_type="trace_analysis_failed",
                     resource_type="trace",
                     meta_data={
@@ -134,185 +320,369 @@ class RCAAgent(BaseAgent):
             steps = trace_content.get("steps", [])
             logger.info(f"Processing {len(steps)} steps in trace {data.get('id')}")
             
-            # Analyze each step
-            for step in steps:
-                step_type = step.get("step_type", "")
-                step_content = json.dumps(step)
-                
-                # Apply error pattern rules
-                step_issues = await self._detect_error_patterns(step_content)
-                if step_issues:
-                    issues.extend(step_issues)
-                    # Log detected issues
-                    for issue in step_issues:
-                        audit_log = await self.audit_service.log_system_action(
-                            action_type="issue_detected",
-                            resource_type="trace",
-                            meta_data={
-                                "trace_id": data.get("id"),
-                                "issue_type": issue["type"],
-                                "severity": issue["severity"],
-                                "pattern": issue.get("pattern", ""),
-                                "line_number": issue.get("line_number", 0)
-                            }
-                        )
-                        logger.info(f"Audit log created for issue detection: {audit_log.id if audit_log else 'None'}")
-                
-                # Check performance metrics if available
-                if "duration_ms" in step:
-                    metrics = {"response_time": step["duration_ms"]}
-                    step_issues = await self._analyze_performance_metrics(metrics)
-                    if step_issues:
-                        issues.extend(step_issues)
-                        # Log performance issues
-                        for issue in step_issues:
-                            audit_log = await self.audit_service.log_system_action(
-                                action_type="performance_issue_detected",
-                                resource_type="trace",
-                                meta_data={
-                                    "trace_id": data.get("id"),
-                                    "metric": issue["metric"],
-                                    "value": issue["value"],
-                                    "threshold": issue["threshold"]
-                                }
-                            )
-                            logger.info(f"Audit log created for performance issue: {audit_log.id if audit_log else 'None'}")
+            # The scan is pure CPU, so run it off the event loop
+            step_results, correlation_issues = await asyncio.to_thread(
+                self._analyze_trace, trace_content, analysis_timestamp
+            )
+            
+            audits = []
+            for error_issues, performance_issues in step_results:
+                issues.extend(error_issues)
+                issues.extend(performance_issues)
+                audits.extend(self._step_issue_audits(data, error_issues, performance_issues))
             
-            # Apply correlation rules to the entire trace
-            trace_content_str = json.dumps(trace_content)
-            correlation_issues = await self._apply_correlation_rules(trace_content_str)
             issues.extend(correlation_issues)
+            audits.extend(self._correlation_audits(data, correlation_issues))
+            await self._flush_audits(audits)
             
-            # Log correlation findings
-            for issue in correlation_issues:
-                audit_log = await self.audit_service.log_system_action(
-                    action_type="correlation_found",
-                    resource_type="trace",
-                    meta_data={
-                        "trace_id": data.get("id"),
-                        "rule": issue["rule"],
-                        "group_by": issue["group_by"]
-                    }
-                )
-                logger.info(f"Audit log created for correlation finding: {audit_log.id if audit_log else 'None'}")
+            return await self._complete_analysis(data, issues, analysis_timestamp)
+        except Exception as e:
+            return await self._fail_analysis(data, e, analysis_timestamp)
+    
+    async def process_stream(
+        self,
+        data: Dict[str, Any],
+        source: Union[str, os.PathLike, BinaryIO],
+        skip_step_types: Iterable[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Perform root cause analysis on a trace streamed from a JSON document.
+        
+        Steps are parsed one at a time from content.steps, so peak memory is
+        bounded by the largest step rather than the whole trace. Correlation
+        rules are applied per step since the full trace is never materialized.
+        
+        Args:
+            data: Trace metadata (id, user_id, timestamp, ...) without content
+            source: Path to, or binary file object of, the trace JSON document
+            skip_step_types: Step types to skip before they are scanned
             
-            # If no issues found with rules, try LLM analysis
-            if not issues and self.llm_client:
-                logger.info("No issues found with rules, trying LLM analysis")
-                llm_analysis = await self._analyze_with_llm(data)
-                if llm_analysis:
-                    issues.append(llm_analysis)
-                    audit_log = await self.audit_service.log_system_action(
-                        action_type="llm_analysis_completed",
-                        resource_type="trace",
-                        meta_data={
-                            "trace_id": data.get("id"),
-                            "analysis_type": "llm",
-                            "findings": llm_analysis
-                        }
-                    )
-                    logger.info(f"Audit log created for LLM analysis: {audit_log.id if audit_log else 'None'}")
+        Returns:
+            Dict containing analysis results and detected issues
+        """
+        analysis_timestamp = datetime.now().isoformat()
+        skip_step_types = frozenset(skip_step_types)
+        try:
+            logger.info(f"Starting streamed trace analysis for trace {data.get('id')}")
+            audit_log = await self._log_system_action(
+                action_type="trace_analysis_start",
+                resource_type="trace",
+                meta_data={
+                    "trace_id": data.get("id"),
+                    "file_name": data.get("file_name"),
+                    "file_size": data.get("file_size")
+                }
+            )
+            logger.info(f"Audit log created for trace analysis start: {audit_log.id if audit_log else 'None'}")
             
-            # Group and deduplicate issues
-            issues = await self._group_issues(issues)
+            # Parsing and scanning are blocking, so run them off the event loop
+            issues, audits = await asyncio.to_thread(
+                self._analyze_stream, data, source, skip_step_types, analysis_timestamp
+            )
+            await self._flush_audits(audits)
             
-            if issues:
-                logger.info(f"Found {len(issues)} issues in trace {data.get('id')}")
-                result = await self._create_issues(data, issues)
-                # Log completion with issues
-                audit_log = await self.audit_service.log_system_action(
-                    action_type="trace_analysis_completed",
+            return await self._complete_analysis(data, issues, analysis_timestamp)
+        except Exception as e:
+            return await self._fail_analysis(data, e, analysis_timestamp)
+    
+    def _analyze_stream(
+        self,
+        data: Dict[str, Any],
+        source: Union[str, os.PathLike, BinaryIO],
+        skip_step_types: FrozenSet[str],
+        timestamp: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Parse and analyze streamed steps, returning the issues and their audit entries."""
+        issues = []
+        audits = []
+        owns_file = isinstance(source, (str, os.PathLike))
+        fp = open(source, "rb") if owns_file else source
+        try:
+            for step in ijson.items(fp, "content.steps.item", use_float=True):
+                if step.get("step_type") in skip_step_types:
+                    continue
+                
+                error_issues, performance_issues, correlation_issues = self._analyze_step(step, timestamp)
+                issues.extend(error_issues)
+                issues.extend(performance_issues)
+                issues.extend(correlation_issues)
+                audits.extend(self._step_issue_audits(data, error_issues, performance_issues))
+                audits.extend(self._correlation_audits(data, correlation_issues))
+        finally:
+            if owns_file:
+                fp.close()
+        return issues, audits
+    
+    async def _fail_analysis(self, data: Dict[str, Any], error: Exception, analysis_timestamp: str) -> Dict[str, Any]:
+        """Record a failed analysis run and build the failure response."""
+        logger.error(f"Error processing trace: {str(error)}")
+        # Log error
+        audit_log = await self._log_system_action(
+            action_type="trace_analysis_failed",
+            resource_type="trace",
+            meta_data={
+                "trace_id": data.get("id"),
+                "error": str(error),
+                "error_type": type(error).__name__
+            }
+        )
+        logger.info(f"Audit log created for trace analysis error: {audit_log.id if audit_log else 'None'}")
+        return {
+            "status": "failed",
+            "error": str(error),
+            "issues_found": False,
+            "issues": [],
+            "analysis_timestamp": analysis_timestamp
+        }
+    
+    def _step_issue_audits(
+        self,
+        data: Dict[str, Any],
+        error_issues: List[Dict[str, Any]],
+        performance_issues: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Build the audit log entries for the issues detected in one step."""
+        audits = [
+            {
+                "action_type": "issue_detected",
+                "resource_type": "trace",
+                "meta_data": {
+                    "trace_id": data.get("id"),
+                    "issue_type": issue["type"],
+                    "severity": issue["severity"],
+                    "pattern": issue.get("pattern", ""),
+                    "line_number": issue.get("line_number", 0),
+                    "count": issue.get("count", 1)
+                }
+            }
+            for issue in error_issues
+        ]
+        audits.extend(
+            {
+                "action_type": "performance_issue_detected",
+                "resource_type": "trace",
+                "meta_data": {
+                    "trace_id": data.get("id"),
+                    "metric": issue["metric"],
+                    "value": issue["value"],
+                    "threshold": issue["threshold"]
+                }
+            }
+            for issue in performance_issues
+        )
+        return audits
+    
+    def _correlation_audits(self, data: Dict[str, Any], correlation_issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build the audit log entries for correlation findings."""
+        return [
+            {
+                "action_type": "correlation_found",
+                "resource_type": "trace",
+                "meta_data": {
+                    "trace_id": data.get("id"),
+                    "rule": issue["rule"],
+                    "group_by": issue["group_by"]
+                }
+            }
+            for issue in correlation_issues
+        ]
+    
+    async def _flush_audits(self, audits: List[Dict[str, Any]]) -> None:
+        """Write queued audit log entries in a single transaction."""
+        if not audits:
+            return
+        with self.db_factory(expire_on_commit=False) as db:
+            audit_logs = await AuditService(db).log_system_actions(audits)
+        logger.info(f"Audit logs created: {len(audit_logs)} of {len(audits)} queued")
+    
+    async def _complete_analysis(
+        self,
+        data: Dict[str, Any],
+        issues: List[Dict[str, Any]],
+        analysis_timestamp: str
+    ) -> Dict[str, Any]:
+        """Fall back to the LLM if needed, then group, persist and report the detected issues."""
+        # If no issues found with rules, try LLM analysis
+        if not issues and self.llm_client:
+            logger.info("No issues found with rules, trying LLM analysis")
+            llm_analysis = await self._analyze_with_llm(data)
+            if llm_analysis:
+                issues.append(llm_analysis)
+                audit_log = await self._log_system_action(
+                    action_type="llm_analysis_completed",
                     resource_type="trace",
                     meta_data={
                         "trace_id": data.get("id"),
-                        "issues_found": True,
-                        "issue_count": len(issues),
-                        "severities": [issue["severity"] for issue in issues]
+                        "analysis_type": "llm",
+                        "findings": llm_analysis
                     }
                 )
-                logger.info(f"Audit log created for trace analysis completion: {audit_log.id if audit_log else 'None'}")
-                return result
-            
-            # Log completion without issues
-            logger.info(f"No issues found in trace {data.get('id')}")
-            audit_log = await self.audit_service.log_system_action(
+                logger.info(f"Audit log created for LLM analysis: {audit_log.id if audit_log else 'None'}")
+        
+        # Group and deduplicate issues
+        issues = self._group_issues(issues)
+        
+        if issues:
+            logger.info(f"Found {len(issues)} issues in trace {data.get('id')}")
+            result = await self._create_issues(data, issues)
+            # Log completion with issues
+            audit_log = await self._log_system_action(
                 action_type="trace_analysis_completed",
                 resource_type="trace",
                 meta_data={
                     "trace_id": data.get("id"),
-                    "issues_found": False
-                }
-            )
-            logger.info(f"Audit log created for trace analysis completion (no issues): {audit_log.id if audit_log else 'None'}")
-            
-            return {
-                "status": "completed",
-                "issues_found": False,
-                "issues": [],
-                "analysis_timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            logger.error(f"Error processing trace: {str(e)}")
-            # Log error
-            audit_log = await self.audit_service.log_system_action(
-                action_type="trace_analysis_failed",
-                resource_type="trace",
-                meta_data={
-                    "trace_id": data.get("id"),
-                    "error": str(e),
-                    "error_type": type(e).__name__
+                    "issues_found": True,
+                    "issue_count": len(issues),
+                    "severities": [issue["severity"] for issue in issues]
                 }
             )
-            logger.info(f"Audit log created for trace analysis error: {audit_log.id if audit_log else 'None'}")
-            return {
-                "status": "failed",
-                "error": str(e),
-                "issues_found": False,
-                "issues": [],
-                "analysis_timestamp": datetime.now().isoformat()
+            logger.info(f"Audit log created for trace analysis completion: {audit_log.id if audit_log else 'None'}")
+            return result
+        
+        # Log completion without issues
+        logger.info(f"No issues found in trace {data.get('id')}")
+        audit_log = await self._log_system_action(
+            action_type="trace_analysis_completed",
+            resource_type="trace",
+            meta_data={
+                "trace_id": data.get("id"),
+                "issues_found": False
             }
+        )
+        logger.info(f"Audit log created for trace analysis completion (no issues): {audit_log.id if audit_log else 'None'}")
+        
+        return {
+            "status": "completed",
+            "issues_found": False,
+            "issues": [],
+            "analysis_timestamp": analysis_timestamp
+        }
     
-    async def _detect_error_patterns(self, content: str) -> List[Dict[str, Any]]:
-        """Detect issues using error patterns."""
-        issues = []
-        for rule in self.rules["error_patterns"]:
-            matches = re.finditer(rule["pattern"], content, re.IGNORECASE)
-            for match in matches:
-                line_number = content[:match.start()].count('\n') + 1
-                context = self._get_context(content, match.start(), 3)
-                
-                issues.append({
-                    "type": "error_pattern",
-                    "pattern": rule["pattern"],
-                    "severity": rule["severity"],
-                    "line_number": line_number,
-                    "context": context,
-                    "timestamp": datetime.now().isoformat(),
-                    "category": "error"
-                })
-        return issues
+    def _analyze_trace(
+        self,
+        trace_content: Dict[str, Any],
+        timestamp: str
+    ) -> Tuple[List[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]], List[Dict[str, Any]]]:
+        """
+        Analyze every step, then collect correlation issues for the entire trace.
+        
+        No rule can match across a line break, so correlating each step's text
+        while it is already encoded finds the same hits as one pass over the
+        whole trace; only values outside the steps are scanned separately.
+        """
+        step_results = []
+        correlation_issues = []
+        for step in trace_content.get("steps", []):
+            error_issues, performance_issues, step_correlation_issues = self._analyze_step(step, timestamp)
+            step_results.append((error_issues, performance_issues))
+            correlation_issues.extend(step_correlation_issues)
+        
+        remainder = {key: value for key, value in trace_content.items() if key != "steps"}
+        correlation_issues.extend(
+            self._apply_correlation_rules("\n".join(_string_leaves(remainder)).encode(), timestamp)
+        )
+        return step_results, correlation_issues
+    
+    def _analyze_step(
+        self,
+        step: Dict[str, Any],
+        timestamp: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Run error pattern, performance and correlation analysis for a single trace step."""
+        timestamp = timestamp or datetime.now().isoformat()
+        # Encode the step once and run both rule families over it while it is hot
+        content = "\n".join(_string_leaves(step)).encode()
+        error_issues = self._detect_error_patterns(content, timestamp)
+        correlation_issues = self._apply_correlation_rules(content, timestamp)
+        
+        # Check performance metrics if available
+        performance_issues = []
+        if "duration_ms" in step:
+            metrics = {"response_time": step["duration_ms"]}
+            performance_issues = self._analyze_performance_metrics(metrics, timestamp)
+        
+        return error_issues, performance_issues, correlation_issues
     
-    async def _analyze_performance_metrics(self, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _may_contain_error(self, lowered: bytes) -> bool:
+        """Cheaply rule out lowercased content that contains none of the error rules' literals."""
+        if self._error_literals is None:
+            return True
+        
+        if self._error_prescreen is not None:
+            # latin-1 maps bytes 1:1 to code points, matching the bytes-mode ASCII case folding
+            return next(self._error_prescreen.iter(lowered.decode("latin-1")), None) is not None
+        return any(literal in lowered for literal in self._error_literals)
+    
+    def _detect_error_patterns(self, content: bytes, timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Detect issues using error patterns.
+        
+        Hits are merged per pattern while scanning: each issue describes the first
+        hit of its pattern and carries the total number of hits in count.
+        """
+        timestamp = timestamp or datetime.now().isoformat()
+        # With literal-only rules the fused regex expects lowercased content;
+        # bytes.lower() only folds ASCII, so offsets into content are unchanged
+        scan_content = content if self._error_literals is None else content.lower()
+        if not self._may_contain_error(scan_content):
+            return []
+        
+        issues = {}
+        newlines = None
+        for position, rule in self._iter_error_hits(scan_content):
+            issue = issues.get(rule["pattern"])
+            if issue is not None:
+                issue["count"] += 1
+                continue
+            
+            if newlines is None:
+                # Index line breaks once, on the first hit, instead of rescanning per match
+                newlines = [match.start() for match in re.finditer(b'\n', content)]
+            line_number = bisect_left(newlines, position) + 1
+            context = self._get_context(content, position, 3, newlines)
+            
+            issues[rule["pattern"]] = {
+                "type": "error_pattern",
+                "pattern": rule["pattern"],
+                "severity": rule["severity"],
+                "line_number": line_number,
+                "context": context,
+                "timestamp": timestamp,
+                "category": "error",
+                "count": 1
+            }
+        return list(issues.values())
+    
+    def _analyze_performance_metrics(
+        self,
+        metrics: Dict[str, Any],
+        timestamp: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """Enhanced performance analysis with trend detection."""
+        timestamp = timestamp or datetime.now().isoformat()
         issues = []
         
-        # Check against static thresholds
-        for metric, threshold in self.rules["performance_thresholds"].items():
-            if metric in metrics:
-                value = metrics[metric]
-                
-                # Check absolute threshold
-                if value > threshold:
-                    issues.append({
-                        "type": "performance_threshold",
-                        "metric": metric,
-                        "value": value,
-                        "threshold": threshold,
-                        "severity": "medium",
-                        "timestamp": datetime.now().isoformat(),
-                        "category": "performance"
-                    })
-                
+        # Walk the supplied metrics (usually just response_time) rather than every threshold
+        for metric, value in metrics.items():
+            threshold = self._performance_thresholds.get(metric)
+            if threshold is None:
+                continue
+            
+            # Check absolute threshold
+            if value > threshold:
+                issues.append({
+                    "type": "performance_threshold",
+                    "metric": metric,
+                    "value": value,
+                    "threshold": threshold,
+                    "severity": "medium",
+                    "timestamp": timestamp,
+                    "category": "performance"
+                })
+            
+            # Read the trend and fold the value in as one step, so a concurrent
+            # trace sees the baseline either before or after this value
+            with self._baselines_lock:
                 # Check trend if we have historical data
                 if metric in self.baselines:
                     baseline = self.baselines[metric]
@@ -323,10 +693,10 @@ class RCAAgent(BaseAgent):
                             "type": "performance_trend",
                             "metric": metric,
                             "value": value,
-                            "baseline": baseline,
+                            "baseline": self._baseline_snapshot(baseline),
                             "trend": trend,
                             "severity": "medium" if abs(trend) < 0.5 else "high",
-                            "timestamp": datetime.now().isoformat(),
+                            "timestamp": timestamp,
                             "category": "performance"
                         })
                 
@@ -337,43 +707,60 @@ class RCAAgent(BaseAgent):
     
     def _calculate_trend(self, current: float, baseline: Dict[str, Any]) -> float:
         """Calculate performance trend."""
-        if not baseline.get("values"):
+        if not baseline["values"]:
             return 0
         
-        avg_baseline = sum(baseline["values"]) / len(baseline["values"])
+        avg_baseline = self._baseline_mean(baseline)
         return (current - avg_baseline) / avg_baseline if avg_baseline != 0 else 0
     
+    @staticmethod
+    def _baseline_mean(baseline: Dict[str, Any]) -> float:
+        """Mean of the values currently in a baseline window."""
+        return baseline["sum"] / len(baseline["values"]) if baseline["values"] else 0
+    
+    @staticmethod
+    def _baseline_snapshot(baseline: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a baseline in its reported shape, detached from later updates."""
+        return {
+            "values": [value for _, value in baseline["values"]],
+            "last_update": baseline["last_update"]
+        }
+    
     def _update_baseline(self, metric: str, value: float):
-        """Update performance baseline."""
+        """Update performance baseline; callers hold _baselines_lock."""
+        now = datetime.now()
         if metric not in self.baselines:
             self.baselines[metric] = {
-                "values": [],
-                "last_update": datetime.now()
+                # (timestamp, value) pairs, capped so a busy metric can't grow without bound
+                "values": deque(maxlen=BASELINE_MAX_VALUES),
+                "sum": 0.0,
+                "last_update": now
             }
         
         baseline = self.baselines[metric]
-        baseline["values"].append(value)
+        values = baseline["values"]
+        if len(values) == values.maxlen:
+            # append() below evicts the oldest value
+            baseline["sum"] -= values[0][1]
+        values.append((now, value))
+        baseline["sum"] += value
         
         # Keep only recent values within window
         window_size = self.rules["trend_analysis"]["window_size"]
-        cutoff_time = datetime.now() - timedelta(seconds=window_size)
+        cutoff_time = now - timedelta(seconds=window_size)
+        while values[0][0] <= cutoff_time:
+            baseline["sum"] -= values.popleft()[1]
         
-        baseline["values"] = [
-            v for v, t in zip(baseline["values"], baseline.get("timestamps", []))
-            if t > cutoff_time
-        ]
-        
-        baseline["last_update"] = datetime.now()
+        baseline["last_update"] = now
     
-    async def _apply_correlation_rules(self, content: str) -> List[Dict[str, Any]]:
+    def _apply_correlation_rules(self, content: bytes, timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
         """Enhanced correlation analysis."""
+        timestamp = timestamp or datetime.now().isoformat()
         issues = []
         
         # Apply all correlation rules
-        for rule_name, rule in self.rules["correlation_rules"].items():
-            matches = re.finditer(rule["pattern"], content, re.IGNORECASE)
-            
-            for match in matches:
+        for rule_name, pattern, rule in self._correlation_rules:
+            for match in pattern.finditer(content):
                 # Extract context
                 context = self._get_context(content, match.start(), 5)
                 
@@ -385,17 +772,17 @@ class RCAAgent(BaseAgent):
                     "group_by": rule["group_by"],
                     "context": context,
                     "severity": "medium",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": timestamp,
                     "category": "correlation"
                 }
                 
                 # Add specific metadata based on rule type
                 if rule_name == "temporal_correlation":
-                    issue["time_window"] = self._extract_time_window(match.group())
+                    issue["time_window"] = self._extract_time_window(match.group().decode())
                 elif rule_name == "service_dependency":
-                    issue["service_name"] = self._extract_service_name(match.group())
+                    issue["service_name"] = self._extract_service_name(match.group().decode())
                 elif rule_name == "resource_correlation":
-                    issue["resource_type"] = self._extract_resource_type(match.group())
+                    issue["resource_type"] = self._extract_resource_type(match.group().decode())
                 
                 issues.append(issue)
         
@@ -403,103 +790,105 @@ class RCAAgent(BaseAgent):
     
     def _extract_time_window(self, text: str) -> Optional[str]:
         """Extract time window from correlation text."""
-        match = re.search(r"within (\d+ (ms|s|m|h))", text)
+        match = _TIME_WINDOW_RE.search(text)
         return match.group(1) if match else None
     
     def _extract_service_name(self, text: str) -> Optional[str]:
         """Extract service name from correlation text."""
-        match = re.search(r"(calling|invoking|requesting) (\w+)", text)
+        match = _SERVICE_NAME_RE.search(text)
         return match.group(2) if match else None
     
     def _extract_resource_type(self, text: str) -> Optional[str]:
         """Extract resource type from correlation text."""
-        match = re.search(r"(CPU|Memory|Disk|Network)", text)
+        match = _RESOURCE_TYPE_RE.search(text)
         return match.group(1) if match else None
     
-    async def _group_issues(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _group_issues(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Group and deduplicate issues."""
         grouped_issues = {}
         for issue in issues:
-            key = f"{issue['type']}:{issue.get('pattern', '')}:{issue.get('metric', '')}"
-            if key not in grouped_issues:
-                grouped_issues[key] = issue
-            else:
-                # Merge similar issues
-                existing = grouped_issues[key]
-                existing["count"] = existing.get("count", 1) + 1
-                if issue["severity"] > existing["severity"]:
+            key = (issue["type"], issue.get("pattern", ""), issue.get("metric", ""))
+            existing = grouped_issues.setdefault(key, issue)
+            if existing is not issue:
+                # Merge similar issues, keeping the most severe rating
+                existing["count"] = existing.get("count", 1) + issue.get("count", 1)
+                if SEVERITY_RANK[issue["severity"]] > SEVERITY_RANK[existing["severity"]]:
                     existing["severity"] = issue["severity"]
         return list(grouped_issues.values())
     
     async def _create_issues(self, trace_data: Dict[str, Any], issues: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create issues in the database and return the result."""
-        db = SessionLocal()
-        try:
-            created_issues = []
-            for issue in issues:
-                # Create issue in database
-                db_issue = Issue(
-                    trace_id=trace_data["id"],
-                    user_id=trace_data["user_id"],
-                    title=f"{issue['type']} - {issue.get('pattern', issue.get('metric', 'Unknown'))}",
-                    description=json.dumps(issue),
-                    status="open",
-                    severity=issue["severity"],
-                    category=issue["category"],
-                    meta_data=issue
-                )
-                db.add(db_issue)
+        # Keep attributes loaded after commit so reading ids/titles below doesn't
+        # re-select every row
+        with self.db_factory(expire_on_commit=False) as db:
+            try:
+                created_issues = [
+                    Issue(
+                        trace_id=trace_data["id"],
+                        user_id=trace_data["user_id"],
+                        title=f"{issue['type']} - {issue.get('pattern', issue.get('metric', 'Unknown'))}",
+                        description=orjson.dumps(issue).decode(),
+                        status="open",
+                        severity=issue["severity"],
+                        category=issue["category"],
+                        meta_data=issue
+                    )
+                    for issue in issues
+                ]
+                # Insert all issues in a single transaction
+                db.add_all(created_issues)
                 db.commit()
-                db.refresh(db_issue)
-                created_issues.append(db_issue)
                 
                 # Log issue creation
-                audit_log = await self.audit_service.log_system_action(
-                    action_type="issue_created",
-                    resource_type="issue",
-                    resource_id=db_issue.id,
+                await self._flush_audits([
+                    {
+                        "action_type": "issue_created",
+                        "resource_type": "issue",
+                        "resource_id": db_issue.id,
+                        "meta_data": {
+                            "trace_id": trace_data["id"],
+                            "issue_type": issue["type"],
+                            "severity": issue["severity"],
+                            "title": db_issue.title
+                        }
+                    }
+                    for db_issue, issue in zip(created_issues, issues)
+                ])
+                
+                # Send notifications once the issues are persisted
+                await asyncio.gather(*(
+                    self._notify_about_issue(db_issue, trace_data, trace_data["user"])
+                    for db_issue in created_issues
+                ))
+                
+                return {
+                    "status": "completed",
+                    "issues_found": True,
+                    "issues": [issue.id for issue in created_issues],
+                    "analysis_timestamp": datetime.now().isoformat()
+                }
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Error creating issues: {str(e)}")
+                # Log error
+                audit_log = await self._log_system_action(
+                    action_type="issue_creation_failed",
+                    resource_type="trace",
                     meta_data={
                         "trace_id": trace_data["id"],
-                        "issue_type": issue["type"],
-                        "severity": issue["severity"],
-                        "title": db_issue.title
+                        "error": str(e),
+                        "error_type": type(e).__name__
                     }
                 )
-                logger.info(f"Audit log created for issue creation: {audit_log.id if audit_log else 'None'}")
-                
-                # Send notification
-                await self._notify_about_issue(db_issue, trace_data, trace_data["user"])
-            
-            return {
-                "status": "completed",
-                "issues_found": True,
-                "issues": [issue.id for issue in created_issues],
-                "analysis_timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Error creating issues: {str(e)}")
-            # Log error
-            audit_log = await self.audit_service.log_system_action(
-                action_type="issue_creation_failed",
-                resource_type="trace",
-                meta_data={
-                    "trace_id": trace_data["id"],
-                    "error": str(e),
-                    "error_type": type(e).__name__
-                }
-            )
-            logger.info(f"Audit log created for issue creation error: {audit_log.id if audit_log else 'None'}")
-            raise
-        finally:
-            db.close()
+                logger.info(f"Audit log created for issue creation error: {audit_log.id if audit_log else 'None'}")
+                raise
     
-    async def validate(self, data: Dict[str, Any]) -> bool:
+    def validate(self, data: Dict[str, Any]) -> bool:
         """Validate trace data."""
         required_fields = ["content", "timestamp", "id"]
         return all(field in data for field in required_fields)
     
-    async def get_metadata(self) -> Dict[str, Any]:
+    def get_metadata(self) -> Dict[str, Any]:
         """Get agent metadata."""
         return {
             "name": "RCA Agent",
@@ -513,11 +902,42 @@ class RCAAgent(BaseAgent):
             ]
         }
     
-    def _get_context(self, content: str, position: int, lines: int) -> List[str]:
-        """Get context around a position in the content."""
-        lines_before = content[:position].split('\n')[-lines:]
-        lines_after = content[position:].split('\n')[:lines]
-        return lines_before + lines_after
+    def _get_context(
+        self,
+        content: bytes,
+        position: int,
+        lines: int,
+        newlines: Optional[List[int]] = None
+    ) -> List[str]:
+        """
+        Get context around a position in the content.
+        
+        Only the slice around position is split, never the whole content. The
+        sorted offsets of every newline in content can be supplied to locate the
+        slice by bisection; otherwise it is found by walking newlines outwards.
+        Only the returned lines are decoded.
+        """
+        if newlines is not None:
+            index = bisect_left(newlines, position)
+            start = newlines[index - lines] + 1 if index >= lines else 0
+            end = newlines[index + lines - 1] if index + lines - 1 < len(newlines) else len(content)
+        else:
+            start = position
+            for _ in range(lines):
+                start = content.rfind(b'\n', 0, start)
+                if start < 0:
+                    break
+            start += 1
+            
+            end = position - 1
+            for _ in range(lines):
+                end = content.find(b'\n', end + 1)
+                if end < 0:
+                    end = len(content)
+                    break
+        
+        context = content[start:position].split(b'\n') + content[position:end].split(b'\n')
+        return [line.decode("utf-8", "replace") for line in context]
     
     async def _analyze_with_llm(self, trace_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Analyze trace data using LLM."""
@@ -582,25 +1002,35 @@ class RCAAgent(BaseAgent):
                 }
             )
             
+            sends = []
             # Send Slack notification
             if os.getenv("SLACK_ALERT_CHANNEL"):
-                await self.external_notification.send_slack_notification(
+                sends.append(self.external_notification.send_slack_notification(
                     channel=os.getenv("SLACK_ALERT_CHANNEL"),
                     message=notification_content["slack"]["text"],
                     blocks=notification_content["slack"]["blocks"]
-                )
+                ))
             
             # Send email notification
             if user.email:
-                await self.external_notification.send_email_notification(
+                sends.append(self.external_notification.send_email_notification(
                     to_email=user.email,
                     subject=notification_content["email"]["subject"],
                     message=notification_content["email"]["text"],
                     html_message=notification_content["email"]["html"]
-                )
+                ))
+            
+            # The channels are independent, so send concurrently and let one
+            # failing channel not cancel the other
+            results = await asyncio.gather(*sends, return_exceptions=True)
+            errors = [result for result in results if isinstance(result, Exception)]
+            for error in errors:
+                logger.error(f"Notification channel failed: {str(error)}")
+            if errors:
+                raise errors[0]
             
             # Log the notification
-            await self.audit_service.log_action(
+            await self._log_action(
                 user_id=user.id,
                 action_type="issue_notification_sent",
                 resource_type="issue",
@@ -616,7 +1046,7 @@ class RCAAgent(BaseAgent):
         except Exception as e:
             logger.error(f"Failed to send external notifications: {str(e)}")
             # Log the failure
-            await self.audit_service.log_action(
+            await self._log_action(
                 user_id=user.id,
                 action_type="notification_failed",
                 resource_type="issue",
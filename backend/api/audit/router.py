@@ -1,30 +1,293 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from functools import lru_cache
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Literal, Optional, Tuple
+from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timedelta
-from sqlalchemy import or_
+from sqlalchemy import or_, select, table, literal_column, func, tuple_, cast, Text
+from sqlalchemy.sql import operators
+import asyncio
+import base64
+import orjson
 import os
 import logging
-from slack_sdk.errors import SlackApiError
+import operator
+import time
 
-from api.database.database import get_db
+from api.database.database import get_db, AsyncSessionLocal
 from api.models.database import AuditLog, User
-from api.models.audit import AuditLogCreate, AuditLogFilter, AuditLogResponse
+from api.models.audit import AuditLogCreate, AuditLogFilter, AuditLogPage
 from api.auth.router import get_current_user
 from api.services.audit import AuditService
-from api.services.external_notification import ExternalNotificationService
+from api.services.audit_cache import audit_cache
+from api.services.ttl_cache import TTLCache
+from config.settings import settings
 
 router = APIRouter(
     prefix="/audit",
     tags=["audit"],
     responses={404: {"description": "Not found"}},
+    default_response_class=ORJSONResponse,
 )
 
 logger = logging.getLogger(__name__)
 
+# Columns backing AuditLogResponse; metadata is read as its stored JSON text
+AUDIT_LOG_RESPONSE_COLUMNS = (
+    AuditLog.id,
+    AuditLog.user_id,
+    AuditLog.action_type,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    cast(AuditLog.meta_data, Text).label("meta_data"),
+    AuditLog.created_at,
+)
+
+# AuditLogFilter fields that map onto a plain column comparison
+AUDIT_LOG_FILTERS = (
+    ("action_types", AuditLog.action_type, operators.in_op),
+    ("resource_type", AuditLog.resource_type, operator.eq),
+    ("resource_types", AuditLog.resource_type, operators.in_op),
+    ("resource_id", AuditLog.resource_id, operator.eq),
+    ("start_date", AuditLog.created_at, operator.ge),
+    ("end_date", AuditLog.created_at, operator.le),
+)
+
+@lru_cache
+def get_notification_service():
+    """Build the external notification service once per process, importing the Slack SDK on first use."""
+    from api.services.external_notification import ExternalNotificationService
+    return ExternalNotificationService()
+
+# Slack workspace lookups change rarely, so keep them in memory for a while (seconds)
+SLACK_CACHE_TTLS = {"channels": 300, "auth_test": 3600}
+_slack_cache: Dict[str, Tuple[float, Any]] = {}
+
+async def _cached_slack_call(key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+    """Return a cached Slack API response, calling Slack again once its TTL has passed."""
+    now = time.monotonic()
+    cached = _slack_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
+    response = await call()
+    _slack_cache[key] = (now + SLACK_CACHE_TTLS[key], response)
+    return response
+
+async def _list_slack_channels(slack_client) -> List[str]:
+    """List the names of all channels visible to the bot, following Slack's pagination cursor."""
+    channel_names = []
+    cursor = None
+    while True:
+        response = await slack_client.conversations_list(
+            types="public_channel,private_channel",
+            limit=200,
+            cursor=cursor
+        )
+        channel_names.extend(channel["name"] for channel in response.get("channels", []))
+        cursor = (response.get("response_metadata") or {}).get("next_cursor")
+        if not cursor:
+            return channel_names
+
+def _search_filter(db: AsyncSession, search: str):
+    """
+    Build a full-text search predicate over audit log metadata.
+
+    Uses the GIN-indexed tsvector column on PostgreSQL and the FTS5 index on
+    SQLite (prefix match on the search phrase); other backends fall back to
+    a substring scan.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return literal_column("audit_logs.meta_data_tsv").op("@@")(
+            func.plainto_tsquery("simple", search)
+        )
+    if dialect == "sqlite":
+        phrase = '"' + search.replace('"', '""') + '"*'
+        matches = (
+            select(literal_column("rowid"))
+            .select_from(table("audit_logs_fts"))
+            .where(literal_column("audit_logs_fts").op("MATCH")(phrase))
+        )
+        return AuditLog.id.in_(matches)
+    return AuditLog.meta_data.ilike(f"%{search}%")
+
+def _encode_cursor(log: AuditLog) -> str:
+    """Encode the (created_at, id) position of an audit log as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{log.created_at.isoformat()}|{log.id}".encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(log_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+async def _fetch_page(db: AsyncSession, query, cursor: Optional[str], limit: int, sort_order: str) -> dict:
+    """
+    Fetch one page of audit logs using keyset pagination on (created_at, id).
+
+    Each page seeks past the cursor instead of skipping rows, so deep pages
+    cost the same as the first one.
+    """
+    descending = sort_order == "desc"
+    position = tuple_(AuditLog.created_at, AuditLog.id)
+    if cursor:
+        created_at, log_id = _decode_cursor(cursor)
+        after = tuple_(created_at, log_id)
+        query = query.where(position < after if descending else position > after)
+    
+    if descending:
+        query = query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+    else:
+        query = query.order_by(AuditLog.created_at.asc(), AuditLog.id.asc())
+    
+    # Fetch one extra row to tell whether another page follows. Only the
+    # response columns are loaded and the rows skip ORM and schema validation.
+    result = await db.execute(query.with_only_columns(*AUDIT_LOG_RESPONSE_COLUMNS).limit(limit + 1))
+    rows = result.all()
+    next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return {"items": rows[:limit], "next_cursor": next_cursor, "has_more": next_cursor is not None}
+
+def _dump_page(page: dict) -> bytes:
+    """
+    Serialize a page of audit log rows as AuditLogPage JSON, splicing each
+    row's stored metadata in as-is instead of decoding and re-encoding it.
+    """
+    items = b",".join(
+        b'{"meta_data":' + (row.meta_data or "null").encode() + b"," + orjson.dumps(
+            {key: value for key, value in row._mapping.items() if key != "meta_data"}
+        )[1:]
+        for row in page["items"]
+    )
+    fields = orjson.dumps({key: value for key, value in page.items() if key != "items"})
+    return b'{"items":[' + items + b"]," + fields[1:]
+
+# Audit log totals per (user, action type) as (refreshed at, count). A total
+# older than AUDIT_COUNT_REFRESH is still served while a background task
+# recounts it, so listings never wait on a count.
+_audit_counts = TTLCache(maxsize=10000, ttl=settings.AUDIT_COUNT_REFRESH * 10)
+_count_refreshes: Dict[Tuple[int, Optional[str]], asyncio.Task] = {}
+
+async def _refresh_count(user_id: int, action_type: Optional[str]) -> None:
+    """Recount a user's audit logs in a session of its own and store the total."""
+    query = select(func.count()).select_from(AuditLog).where(AuditLog.user_id == user_id)
+    if action_type:
+        query = query.where(AuditLog.action_type == action_type)
+    try:
+        async with AsyncSessionLocal() as db:
+            count = await db.scalar(query)
+    except SQLAlchemyError as e:
+        logger.error(f"Error counting audit logs for user {user_id}: {str(e)}")
+        return
+    _audit_counts.set((user_id, action_type), (time.monotonic(), count))
+
+def _approx_count(
+    user_id: int,
+    action_type: Optional[str] = None,
+    filter: Optional[AuditLogFilter] = None
+) -> Optional[int]:
+    """
+    Return the last known total of a user's audit logs, scheduling a recount
+    in the background when it is missing or stale.
+
+    Returns None when the filter narrows the listing beyond user and action type,
+    and until the first count for a user and action type has finished.
+    """
+    if filter is not None and (
+        filter.search or any(getattr(filter, name) is not None for name, _, _ in AUDIT_LOG_FILTERS)
+    ):
+        return None
+    
+    key = (user_id, action_type or None)
+    entry = _audit_counts.get(key)
+    if (entry is None or entry[0] + settings.AUDIT_COUNT_REFRESH <= time.monotonic()) and key not in _count_refreshes:
+        task = asyncio.create_task(_refresh_count(*key))
+        _count_refreshes[key] = task
+        task.add_done_callback(lambda _: _count_refreshes.pop(key, None))
+    return entry[1] if entry is not None else None
+
+def _build_audit_query(db: AsyncSession, user_id: int, action_type: Optional[str], filter: AuditLogFilter):
+    """Build the filtered audit log statement shared by the listing endpoints."""
+    query = select(AuditLog).where(AuditLog.user_id == user_id)
+    if action_type:
+        query = query.where(AuditLog.action_type == action_type)
+    for name, column, compare in AUDIT_LOG_FILTERS:
+        value = getattr(filter, name)
+        if value is not None:
+            query = query.where(compare(column, value))
+    if filter.search:
+        query = query.where(_search_filter(db, filter.search))
+    return query
+
+# Columns the keyset pagination can order by; created_at ties are broken by id
+AuditLogSortColumn = Literal["created_at"]
+
+def _audit_log_filter(
+    user_id: Optional[int] = None,
+    action_type: Optional[str] = None,
+    action_types: Optional[List[str]] = Query(None),
+    resource_type: Optional[str] = None,
+    resource_types: Optional[List[str]] = Query(None),
+    resource_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    search: Optional[str] = None
+) -> AuditLogFilter:
+    """
+    Read an AuditLogFilter from the query string.
+
+    List fields take repeated parameters (?action_types=a&action_types=b), which
+    FastAPI only parses from the query string when declared with Query.
+    """
+    return AuditLogFilter(
+        user_id=user_id,
+        action_type=action_type,
+        action_types=action_types,
+        resource_type=resource_type,
+        resource_types=resource_types,
+        resource_id=resource_id,
+        start_date=start_date,
+        end_date=end_date,
+        search=search
+    )
+
+async def _serve_page(
+    scope: str,
+    user_id: int,
+    action_type: Optional[str],
+    filter: AuditLogFilter,
+    cursor: Optional[str],
+    limit: int,
+    sort_order: str
+) -> Response:
+    """
+    Serve one page of audit logs, reusing a cached copy while the user's
+    audit log is unchanged.
+
+    The session is opened only on a cache miss and closed as soon as the
+    page is loaded, so a pooled connection is held for the queries alone
+    rather than for the whole request.
+    """
+    params = {"scope": scope, **filter.model_dump(), "cursor": cursor, "limit": limit, "sort_order": sort_order}
+    
+    async def load_page() -> bytes:
+        async with AsyncSessionLocal() as db:
+            query = _build_audit_query(db, user_id, action_type, filter)
+            page = await _fetch_page(db, query, cursor, limit, sort_order)
+        return _dump_page(page)
+    
+    body = await audit_cache.fetch(user_id, params, load_page)
+    # The total is refreshed on its own schedule, so it is added after the page cache
+    approx_total = orjson.dumps(_approx_count(user_id, action_type, filter))
+    return Response(content=body[:-1] + b',"approx_total":' + approx_total + b"}", media_type="application/json")
+
 @router.get(
     "/",
-    response_model=List[AuditLogResponse],
+    response_model=AuditLogPage,
     summary="Get audit logs",
     description="Get audit logs with filtering, sorting, and search capabilities.",
     responses={
@@ -33,46 +296,24 @@ logger = logging.getLogger(__name__)
     }
 )
 async def get_audit_logs(
-    filter: AuditLogFilter = Depends(),
-    skip: int = Query(0, ge=0),
+    filter: AuditLogFilter = Depends(_audit_log_filter),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
-    sort_by: str = Query("created_at"),
-    sort_order: str = Query("desc"),
-    db: Session = Depends(get_db),
+    sort_by: AuditLogSortColumn = Query("created_at"),
+    sort_order: Literal["asc", "desc"] = Query("desc"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get audit logs with filtering, sorting, and pagination.
     Only shows logs for the current user.
     """
-    query = db.query(AuditLog).filter(AuditLog.user_id == current_user.id)
-    
-    # Apply filters
-    if filter.action_type:
-        query = query.filter(AuditLog.action_type == filter.action_type)
-    if filter.resource_type:
-        query = query.filter(AuditLog.resource_type == filter.resource_type)
-    if filter.resource_id:
-        query = query.filter(AuditLog.resource_id == filter.resource_id)
-    if filter.start_date:
-        query = query.filter(AuditLog.created_at >= filter.start_date)
-    if filter.end_date:
-        query = query.filter(AuditLog.created_at <= filter.end_date)
-    if filter.search:
-        query = query.filter(AuditLog.meta_data.ilike(f"%{filter.search}%"))
-    
-    # Apply sorting
-    if sort_order.lower() == "desc":
-        query = query.order_by(getattr(AuditLog, sort_by).desc())
-    else:
-        query = query.order_by(getattr(AuditLog, sort_by).asc())
-    
-    # Apply pagination
-    return query.offset(skip).limit(limit).all()
+    return await _serve_page(
+        "all", current_user.id, filter.action_type, filter, cursor, limit, sort_order
+    )
 
 @router.get(
     "/user/{user_id}",
-    response_model=List[AuditLogResponse],
+    response_model=AuditLogPage,
     summary="Get user audit logs",
     description="Get audit logs for a specific user.",
     responses={
@@ -83,12 +324,11 @@ async def get_audit_logs(
 )
 async def get_user_audit_logs(
     user_id: int,
-    filter: AuditLogFilter = Depends(),
-    skip: int = Query(0, ge=0),
+    filter: AuditLogFilter = Depends(_audit_log_filter),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
-    sort_by: str = Query("created_at"),
-    sort_order: str = Query("desc"),
-    db: Session = Depends(get_db),
+    sort_by: AuditLogSortColumn = Query("created_at"),
+    sort_order: Literal["asc", "desc"] = Query("desc"),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -102,34 +342,13 @@ async def get_user_audit_logs(
             detail="Not authorized to view other users' audit logs"
         )
     
-    query = db.query(AuditLog).filter(AuditLog.user_id == current_user.id)
-    
-    # Apply filters
-    if filter.action_type:
-        query = query.filter(AuditLog.action_type == filter.action_type)
-    if filter.resource_type:
-        query = query.filter(AuditLog.resource_type == filter.resource_type)
-    if filter.resource_id:
-        query = query.filter(AuditLog.resource_id == filter.resource_id)
-    if filter.start_date:
-        query = query.filter(AuditLog.created_at >= filter.start_date)
-    if filter.end_date:
-        query = query.filter(AuditLog.created_at <= filter.end_date)
-    if filter.search:
-        query = query.filter(AuditLog.meta_data.ilike(f"%{filter.search}%"))
-    
-    # Apply sorting
-    if sort_order.lower() == "desc":
-        query = query.order_by(getattr(AuditLog, sort_by).desc())
-    else:
-        query = query.order_by(getattr(AuditLog, sort_by).asc())
-    
-    # Apply pagination
-    return query.offset(skip).limit(limit).all()
+    return await _serve_page(
+        "user", current_user.id, filter.action_type, filter, cursor, limit, sort_order
+    )
 
 @router.get(
     "/action/{action_type}",
-    response_model=List[AuditLogResponse],
+    response_model=AuditLogPage,
     summary="Get action audit logs",
     description="Get audit logs for a specific action type.",
     responses={
@@ -139,43 +358,20 @@ async def get_user_audit_logs(
 )
 async def get_action_audit_logs(
     action_type: str,
-    filter: AuditLogFilter = Depends(),
-    skip: int = Query(0, ge=0),
+    filter: AuditLogFilter = Depends(_audit_log_filter),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(10, ge=1, le=100),
-    sort_by: str = Query("created_at"),
-    sort_order: str = Query("desc"),
-    db: Session = Depends(get_db),
+    sort_by: AuditLogSortColumn = Query("created_at"),
+    sort_order: Literal["asc", "desc"] = Query("desc"),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get audit logs for a specific action type.
     Only shows logs for the current user.
     """
-    query = db.query(AuditLog).filter(
-        AuditLog.action_type == action_type,
-        AuditLog.user_id == current_user.id
+    return await _serve_page(
+        f"action:{action_type}", current_user.id, action_type, filter, cursor, limit, sort_order
     )
-    
-    # Apply filters
-    if filter.resource_type:
-        query = query.filter(AuditLog.resource_type == filter.resource_type)
-    if filter.resource_id:
-        query = query.filter(AuditLog.resource_id == filter.resource_id)
-    if filter.start_date:
-        query = query.filter(AuditLog.created_at >= filter.start_date)
-    if filter.end_date:
-        query = query.filter(AuditLog.created_at <= filter.end_date)
-    if filter.search:
-        query = query.filter(AuditLog.meta_data.ilike(f"%{filter.search}%"))
-    
-    # Apply sorting
-    if sort_order.lower() == "desc":
-        query = query.order_by(getattr(AuditLog, sort_by).desc())
-    else:
-        query = query.order_by(getattr(AuditLog, sort_by).asc())
-    
-    # Apply pagination
-    return query.offset(skip).limit(limit).all()
 
 @router.post("/test")
 async def test_audit_logging(
@@ -210,12 +406,11 @@ async def test_audit_logging(
 
 @router.post("/test-notification")
 async def test_notification(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    notification_service=Depends(get_notification_service)
 ):
     """Test the notification system by sending a test notification."""
     try:
-        notification_service = ExternalNotificationService()
-        
         # Test Slack notification
         slack_success = await notification_service.send_slack_notification(
             channel=os.getenv("SLACK_ALERT_CHANNEL"),
@@ -262,13 +457,13 @@ async def test_notification(
 
 @router.get("/test-slack-permissions")
 async def test_slack_permissions(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    notification_service=Depends(get_notification_service)
 ):
     """Test Slack bot permissions and channel access."""
+    from slack_sdk.errors import SlackApiError
+    
     try:
-        logger.info("Initializing notification service")
-        notification_service = ExternalNotificationService()
-        
         if not notification_service.slack_client:
             logger.error("Slack client not initialized")
             return {
@@ -279,21 +474,19 @@ async def test_slack_permissions(
         logger.info("Attempting to list Slack channels")
         # Test listing channels
         try:
-            response = notification_service.slack_client.conversations_list(
-                types="public_channel,private_channel"
+            channel_names = await _cached_slack_call(
+                "channels",
+                lambda: _list_slack_channels(notification_service.slack_client)
             )
-            logger.info(f"Slack API response: {response}")
+            logger.info(f"Listed {len(channel_names)} Slack channels")
         except SlackApiError as e:
             logger.error(f"Slack API error: {str(e)}")
             logger.error(f"Error response: {e.response}")
             raise
         
-        channels = response.get("channels", [])
-        channel_names = [channel["name"] for channel in channels]
-        
         # Check if our alert channel exists
         alert_channel = os.getenv("SLACK_ALERT_CHANNEL", "").lstrip("#")
-        channel_exists = any(channel["name"] == alert_channel for channel in channels)
+        channel_exists = alert_channel in channel_names
         
         logger.info(f"Available channels: {channel_names}")
         logger.info(f"Looking for alert channel: {alert_channel}")
@@ -325,12 +518,13 @@ async def test_slack_permissions(
 
 @router.get("/test-slack-token")
 async def test_slack_token(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    notification_service=Depends(get_notification_service)
 ):
     """Test if the Slack bot token is valid."""
+    from slack_sdk.errors import SlackApiError
+    
     try:
-        notification_service = ExternalNotificationService()
-        
         if not notification_service.slack_client:
             return {
                 "status": "error",
@@ -338,7 +532,7 @@ async def test_slack_token(
             }
         
         # Test the token by getting bot info
-        response = notification_service.slack_client.auth_test()
+        response = await _cached_slack_call("auth_test", notification_service.slack_client.auth_test)
         
         return {
             "status": "success",
@@ -365,13 +559,11 @@ async def test_slack_token(
 
 @router.post("/test-slack-message")
 async def test_slack_message(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    notification_service=Depends(get_notification_service)
 ):
     """Test sending a message to the Slack alerts channel."""
     try:
-        logger.info("Initializing notification service")
-        notification_service = ExternalNotificationService()
-        
         if not notification_service.slack_client:
             return {
                 "status": "error",
@@ -422,13 +614,13 @@ async def test_slack_message(
 
 @router.get("/test-slack-scopes")
 async def test_slack_scopes(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    notification_service=Depends(get_notification_service)
 ):
     """Test if the Slack bot has the necessary permissions."""
+    from slack_sdk.errors import SlackApiError
+    
     try:
-        logger.info("Initializing notification service")
-        notification_service = ExternalNotificationService()
-        
         if not notification_service.slack_client:
             logger.error("Slack client not initialized")
             return {
@@ -439,11 +631,11 @@ async def test_slack_scopes(
         try:
             # Get bot info to check scopes
             logger.info("Getting auth test info")
-            auth_test = notification_service.slack_client.auth_test()
+            auth_test = await _cached_slack_call("auth_test", notification_service.slack_client.auth_test)
             logger.info(f"Auth test response: {auth_test}")
             
             logger.info("Getting bot info")
-            bot_info = notification_service.slack_client.bots_info(bot=auth_test["bot_id"])
+            bot_info = await notification_service.slack_client.bots_info(bot=auth_test["bot_id"])
             logger.info(f"Bot info response: {bot_info}")
             
             required_scopes = [
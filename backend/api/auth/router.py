@@ -1,27 +1,40 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached, undefer
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from typing import Optional, Dict
+from functools import lru_cache
 from pydantic import BaseModel, ConfigDict, ValidationError, EmailStr
+import asyncio
+import bcrypt
+import hashlib
 import logging
-import re
+import time
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from api.database.database import get_db
+from api.database.database import get_async_db
 from api.models.database import User, AuditLog
 from api.models.user import UserCreate, UserLogin, UserResponse, Token, TokenData
+from api.services.audit_cache import audit_cache
+from api.services.audit_writer import record_audit_log
+from api.services.ttl_cache import TTLCache
 from config.settings import settings
 
 # Set up logging
-logging.basicConfig(level=logging.DEBUG)
+logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Initialize rate limiter; counters live in Redis and fall back to memory while it is unreachable
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    in_memory_fallback_enabled=True
+)
 
 class TokenResponse(BaseModel):
     """Response model for token responses"""
@@ -38,19 +51,40 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt only reads the first 72 bytes of a password; older bcrypt releases truncated silently
+BCRYPT_MAX_PASSWORD_BYTES = 72
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-# Password validation regex
-PASSWORD_REGEX = re.compile(r'.{6,}$')  # Just require minimum 6 characters for now
+# Verified tokens (sha256 of the token -> (user id, exp)) and snapshots of the users they resolve to
+_token_cache = TTLCache(maxsize=10000, ttl=30)
+_user_cache = TTLCache(maxsize=10000, ttl=60)
+
+def _detached_copy(user: User) -> User:
+    """Snapshot a user's loaded columns into a detached instance that later sessions can merge without a query."""
+    unloaded = inspect(user).unloaded
+    snapshot = User(**{
+        column.key: getattr(user, column.key)
+        for column in User.__table__.columns
+        if column.key not in unloaded
+    })
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+# Password validation
+MIN_PASSWORD_LEN = 6  # Just require minimum 6 characters for now
 
 def validate_password(password: str) -> bool:
     """Validate password strength."""
-    return bool(PASSWORD_REGEX.match(password))
+    return len(password) >= MIN_PASSWORD_LEN
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """Hash checked when the email is unknown, so a miss costs the same bcrypt verify as a wrong password."""
+    return get_password_hash("x" * 16)
 
-def validate_email(email: str) -> bool:
-    """Validate email format."""
-    return bool(re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email))
+def _verify_dummy_password(plain_password: str) -> bool:
+    """Check a password against the dummy hash, building it on first use; blocks, so call from an executor."""
+    return verify_password(plain_password, _dummy_hash())
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -58,29 +92,36 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     logger.debug("Verifying password")
     try:
-        result = pwd_context.verify(plain_password, hashed_password)
-        logger.debug(f"Password verification result: {result}")
+        result = bcrypt.checkpw(
+            plain_password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], hashed_password.encode()
+        )
+        logger.debug("Password verification result: %s", result)
         return result
     except Exception as e:
         logger.error(f"Error verifying password: {str(e)}")
         return False
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user by email and password.
+
+    The bcrypt check runs in the default executor so it does not block the event loop,
+    and an unknown email is checked against a dummy hash so it takes as long as a wrong password.
     """
-    logger.debug(f"Attempting to authenticate user: {email}")
-    user = db.query(User).filter(User.email == email).first()
+    logger.debug("Attempting to authenticate user: %s", email)
+    user = await db.scalar(select(User).options(undefer(User.hashed_password)).where(User.email == email))
+    loop = asyncio.get_running_loop()
     
     if not user:
-        logger.warning(f"User not found: {email}")
+        await loop.run_in_executor(None, _verify_dummy_password, password)
+        logger.warning("User not found: %s", email)
         return None
     
-    if not verify_password(password, user.hashed_password):
-        logger.warning(f"Invalid password for user: {email}")
+    if not await loop.run_in_executor(None, verify_password, password, user.hashed_password):
+        logger.warning("Invalid password for user: %s", email)
         return None
     
-    logger.info(f"User authenticated successfully: {email}")
+    logger.info("User authenticated successfully: %s", email)
     return user
 
 def get_password_hash(password: str) -> str:
@@ -89,7 +130,9 @@ def get_password_hash(password: str) -> str:
     """
     logger.debug("Hashing password")
     try:
-        hashed = pwd_context.hash(password)
+        hashed = bcrypt.hashpw(
+            password.encode()[:BCRYPT_MAX_PASSWORD_BYTES], bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+        ).decode()
         logger.debug("Password hashed successfully")
         return hashed
     except Exception as e:
@@ -99,38 +142,61 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+    expires_seconds = int(expires_delta.total_seconds()) if expires_delta else 15 * 60
+    now = int(time.time())
+    to_encode.update({"exp": now + expires_seconds, "iat": now})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
-    """Get current user from JWT token."""
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    """
+    Get current user from JWT token.
+
+    Verified tokens and their users are cached briefly, so repeat requests
+    skip both the signature check and the user query.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    token_key = hashlib.sha256(token.encode()).digest()
+    cached_token = _token_cache.get(token_key)
+    if cached_token is not None and cached_token[1] > time.time():
+        user_id = cached_token[0]
+        snapshot = _user_cache.get(user_id)
+        if snapshot is not None:
+            return await db.merge(snapshot, load=False)
+        user = await db.get(User, user_id)
+        if user is None:
+            raise credentials_exception
+        _user_cache.set(user_id, _detached_copy(user))
+        return user
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
+        user_id: Optional[int] = payload.get("uid")
+        if email is None and user_id is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(email=email, user_id=user_id)
     except JWTError:
         raise credentials_exception
     
     try:
-        user = db.query(User).filter(User.email == token_data.email).first()
-        if user is None:
-            raise credentials_exception
-        return user
-    except Exception as e:
-        logger.error(f"Error getting current user: {str(e)}")
+        if token_data.user_id is not None:
+            user = await db.get(User, token_data.user_id)
+        else:
+            # Tokens issued before the uid claim existed only carry the email
+            user = await db.scalar(select(User).where(User.email == token_data.email))
+    except SQLAlchemyError as e:
+        logger.error("Error getting current user: %s", e, exc_info=True)
         raise credentials_exception
+    if user is None:
+        raise credentials_exception
+    _token_cache.set(token_key, (user.id, payload["exp"]))
+    _user_cache.set(user.id, _detached_copy(user))
+    return user
 
 @router.post("/register", response_model=TokenResponse)
 @limiter.limit("5/minute")
@@ -138,7 +204,7 @@ async def register(
     request: Request,
     user_data: UserCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user.
@@ -151,14 +217,7 @@ async def register(
     logger.info(f"Attempting to register user: {user_data.email}")
     
     try:
-        # Validate email
-        if not validate_email(user_data.email):
-            logger.warning(f"Invalid email format: {user_data.email}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid email format"
-            )
-        
+        # Email format is checked by UserCreate's EmailStr when the body is parsed
         # Validate password
         if not validate_password(user_data.password):
             logger.warning("Invalid password format")
@@ -168,7 +227,7 @@ async def register(
             )
         
         # Check if user already exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
+        existing_user = await db.scalar(select(User.id).where(User.email == user_data.email))
         if existing_user:
             logger.warning(f"User already exists: {user_data.email}")
             raise HTTPException(
@@ -178,16 +237,19 @@ async def register(
         
         # Create new user
         logger.info("Creating new user...")
-        hashed_password = get_password_hash(user_data.password)
-        db_user = User(
-            email=user_data.email,
-            full_name=user_data.full_name,
-            hashed_password=hashed_password,
-            is_active=True
+        hashed_password = await asyncio.get_running_loop().run_in_executor(
+            None, get_password_hash, user_data.password
         )
-        
-        db.add(db_user)
-        db.flush()  # Flush to get the user ID
+        # INSERT ... RETURNING hands back the new row, so no flush or refresh is needed
+        db_user = (await db.scalars(
+            insert(User).values(
+                email=user_data.email,
+                full_name=user_data.full_name,
+                hashed_password=hashed_password,
+                is_active=True
+            ).returning(User)
+        )).one()
+        user_response = UserResponse.from_orm(db_user)
         
         # Create single audit log
         audit_log = AuditLog(
@@ -202,26 +264,28 @@ async def register(
         )
         db.add(audit_log)
         
-        # Commit both user and audit log in a single transaction
-        db.commit()
-        logger.info(f"User created successfully: {db_user.id}")
+        # Commit both user and audit log in a single transaction; the audit row
+        # references the new user, so it is not queued on the background writer
+        await db.commit()
+        await audit_cache.invalidate(user_response.id)
+        logger.info(f"User created successfully: {user_response.id}")
         
         # Create access token
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user_data.email},
+            data={"sub": user_data.email, "uid": user_response.id},
             expires_delta=access_token_expires
         )
         
         return TokenResponse(
-            user=UserResponse.from_orm(db_user),
+            user=user_response,
             token=access_token,
             expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         )
         
-    except Exception as e:
-        logger.error(f"Error in registration: {str(e)}")
-        db.rollback()
+    except SQLAlchemyError as e:
+        logger.error("Error in registration: %s", e, exc_info=True)
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user: {str(e)}"
@@ -232,80 +296,84 @@ async def register(
 async def login(
     request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
     try:
         # Use email as username since that's what we're using for authentication
-        user = authenticate_user(db, form_data.username, form_data.password)
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
+        user = await authenticate_user(db, form_data.username, form_data.password)
+    except SQLAlchemyError as e:
+        logger.error("Login error: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error during login"
+        )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    try:
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user.email}, expires_delta=access_token_expires
+            data={"sub": user.email, "uid": user.id}, expires_delta=access_token_expires
         )
         
-        # Create single audit log
-        audit_log = AuditLog(
-            user_id=user.id,
-            action_type="login",
-            resource_type="user",
-            resource_id=user.id,
-            meta_data={
+        # Queue single audit log
+        await record_audit_log(db, {
+            "user_id": user.id,
+            "action_type": "login",
+            "resource_type": "user",
+            "resource_id": user.id,
+            "meta_data": {
                 "ip_address": request.client.host if request.client else None,
                 "details": f"User logged in: {user.email}"
-            }
-        )
-        db.add(audit_log)
-        db.commit()
+            },
+            "created_at": datetime.utcnow()
+        })
         
         return TokenResponse(
             user=UserResponse.from_orm(user),
             token=access_token,
             expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         )
-    except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+    except SQLAlchemyError as e:
+        logger.error("Login error: %s", e, exc_info=True)
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error during login"
         )
 
 @router.post("/logout")
 async def logout(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Logout the current user.
     """
     try:
-        # Create single audit log
-        audit_log = AuditLog(
-            user_id=current_user.id,
-            action_type="logout",
-            resource_type="user",
-            resource_id=current_user.id,
-            meta_data={
+        # Queue single audit log
+        await record_audit_log(db, {
+            "user_id": current_user.id,
+            "action_type": "logout",
+            "resource_type": "user",
+            "resource_id": current_user.id,
+            "meta_data": {
                 "ip_address": request.client.host if request.client else None,
                 "details": f"User logged out: {current_user.email}"
-            }
-        )
-        db.add(audit_log)
-        db.commit()
+            },
+            "created_at": datetime.utcnow()
+        })
         
         return {"message": "Successfully logged out"}
-    except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
+    except SQLAlchemyError as e:
+        logger.error("Logout error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error during logout"
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, List
-from api.database.database import get_db
+from api.database.database import get_async_db
 from api.auth.router import get_current_user
+from api.models.user import UserResponse
 from api.models.database import User as UserModel, Trace, Issue
 import logging
+import orjson
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -15,97 +19,124 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+async def _user_stats(db: AsyncSession, current_user: UserModel) -> Dict:
+    """Dashboard counters for a user"""
+    # Log current user info
+    logger.info(f"Fetching stats for user: {current_user.id} - {current_user.email}")
+    
+    # Get total traces and active issues counts for current user in one round-trip
+    total_traces, active_issues = (await db.execute(
+        select(
+            select(func.count(Trace.id))
+            .where(Trace.user_id == current_user.id)
+            .scalar_subquery(),
+            select(func.count(Issue.id))
+            .where(Issue.user_id == current_user.id, Issue.status == "open")
+            .scalar_subquery()
+        )
+    )).one()
+    logger.info(f"Found {total_traces} traces and {active_issues} active issues for user {current_user.id}")
+    
+    # Get system health (mock data for now)
+    system_health = 95  # This would be calculated based on actual system metrics
+    
+    # Get average response time (mock data for now)
+    avg_response_time = 150  # This would be calculated from actual response times
+    
+    return {
+        "totalTraces": total_traces,
+        "activeIssues": active_issues,
+        "systemHealth": system_health,
+        "responseTime": avg_response_time
+    }
+
 @router.get("/stats", response_model=Dict)
 async def get_dashboard_stats(
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        # Log current user info
-        logger.info(f"Fetching stats for user: {current_user.id} - {current_user.email}")
-        
-        # Get total traces count for current user
-        total_traces = db.query(Trace).filter(Trace.user_id == current_user.id).count()
-        logger.info(f"Found {total_traces} traces for user {current_user.id}")
-        
-        # Get active issues count for current user
-        active_issues = db.query(Issue).filter(
-            Issue.user_id == current_user.id,
-            Issue.status == "open"
-        ).count()
-        logger.info(f"Found {active_issues} active issues for user {current_user.id}")
-        
-        # Get system health (mock data for now)
-        system_health = 95  # This would be calculated based on actual system metrics
-        
-        # Get average response time (mock data for now)
-        avg_response_time = 150  # This would be calculated from actual response times
-        
-        return {
-            "totalTraces": total_traces,
-            "activeIssues": active_issues,
-            "systemHealth": system_health,
-            "responseTime": avg_response_time
-        }
-    except Exception as e:
-        logger.error(f"Error fetching dashboard stats: {str(e)}")
+        return await _user_stats(db, current_user)
+    except SQLAlchemyError as e:
+        logger.error(f"Error fetching dashboard stats: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error fetching dashboard statistics")
 
+# Mock activity feed as (type, message, age); timestamps are relative to the request time
+RECENT_ACTIVITIES = [
+    ("success", "System scan completed successfully", timedelta(minutes=30)),
+    ("warning", "High CPU usage detected", timedelta(hours=1)),
+    ("info", "New user registered", timedelta(hours=2)),
+]
+
+# orjson writes naive UTC timestamps as ISO 8601 with a Z suffix
+TIMESTAMP_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+# System health metrics (mock data for now), serialized once
+SYSTEM_HEALTH = [
+    {
+        "name": "CPU Usage",
+        "value": 75
+    },
+    {
+        "name": "Memory Usage",
+        "value": 60
+    },
+    {
+        "name": "Disk Space",
+        "value": 85
+    },
+    {
+        "name": "Network Latency",
+        "value": 90
+    }
+]
+SYSTEM_HEALTH_BODY = orjson.dumps(SYSTEM_HEALTH)
+
+def _recent_activities() -> List[Dict]:
+    """Mock activity feed stamped relative to now"""
+    now = datetime.utcnow()
+    return [
+        {
+            "type": activity_type,
+            "message": message,
+            "timestamp": now - age
+        }
+        for activity_type, message, age in RECENT_ACTIVITIES
+    ]
+
 @router.get("/activities", response_model=List[Dict])
 async def get_recent_activities(
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserModel = Depends(get_current_user)
 ):
-    try:
-        # Get recent activities (mock data for now)
-        activities = [
-            {
-                "type": "success",
-                "message": "System scan completed successfully",
-                "timestamp": (datetime.utcnow() - timedelta(minutes=30)).isoformat() + "Z"
-            },
-            {
-                "type": "warning",
-                "message": "High CPU usage detected",
-                "timestamp": (datetime.utcnow() - timedelta(hours=1)).isoformat() + "Z"
-            },
-            {
-                "type": "info",
-                "message": "New user registered",
-                "timestamp": (datetime.utcnow() - timedelta(hours=2)).isoformat() + "Z"
-            }
-        ]
-        return activities
-    except Exception as e:
-        logger.error(f"Error fetching recent activities: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error fetching recent activities")
+    # Get recent activities (mock data for now)
+    body = orjson.dumps(_recent_activities(), option=TIMESTAMP_OPTIONS)
+    return Response(content=body, media_type="application/json")
 
 @router.get("/health", response_model=List[Dict])
 async def get_system_health(
+    current_user: UserModel = Depends(get_current_user)
+):
+    return Response(content=SYSTEM_HEALTH_BODY, media_type="application/json")
+
+@router.get("/bootstrap", response_model=Dict)
+async def get_dashboard_bootstrap(
     current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    """
+    Everything the dashboard page loads on start (the current user, stats,
+    activities and health) in one request, so the token is verified once.
+    """
     try:
-        # Get system health metrics (mock data for now)
-        health_data = [
-            {
-                "name": "CPU Usage",
-                "value": 75
-            },
-            {
-                "name": "Memory Usage",
-                "value": 60
-            },
-            {
-                "name": "Disk Space",
-                "value": 85
-            },
-            {
-                "name": "Network Latency",
-                "value": 90
-            }
-        ]
-        return health_data
-    except Exception as e:
-        logger.error(f"Error fetching system health: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error fetching system health metrics") 
\ No newline at end of file
+        stats = await _user_stats(db, current_user)
+    except SQLAlchemyError as e:
+        logger.error(f"Error fetching dashboard bootstrap: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Error fetching dashboard statistics")
+    
+    body = orjson.dumps({
+        "user": UserResponse.model_validate(current_user).model_dump(mode="json"),
+        "stats": stats,
+        "activities": _recent_activities(),
+        "health": SYSTEM_HEALTH
+    }, option=TIMESTAMP_OPTIONS)
+    return Response(content=body, media_type="application/json")
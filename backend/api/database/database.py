@@ -1,4 +1,7 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from config.settings import settings
 import logging
@@ -6,10 +9,32 @@ from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
+# Applied to every new SQLite connection: WAL lets readers run alongside a
+# writer, and synchronous=NORMAL only fsyncs at checkpoints instead of every commit
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,  # 256 MB
+    "cache_size": -20000,  # Negative means KiB, so about 20 MB
+}
+
+def enable_sqlite_pragmas(engine: Engine) -> None:
+    """Run SQLITE_PRAGMAS on each connection the engine opens; no-op for other databases"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
 # Create SQLite engine
 engine = create_engine(
     settings.DATABASE_URL,
-    echo=True,  # Enable SQL query logging
+    echo=settings.DB_ECHO,  # SQL query logging, off unless DB_ECHO is set
     pool_pre_ping=True,  # Enable connection health checks
     pool_recycle=settings.DB_POOL_RECYCLE,
     pool_size=settings.DB_POOL_SIZE,
@@ -17,6 +42,8 @@ engine = create_engine(
     pool_timeout=settings.DB_POOL_TIMEOUT,
     connect_args={"check_same_thread": False}  # Allow multiple threads to access the database
 )
+enable_sqlite_pragmas(engine)
+logger.info(f"Created database engine {id(engine):#x} for {engine.url!r}")
 
 # Create session factory
 SessionLocal = sessionmaker(
@@ -25,6 +52,40 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async drivers for the configured database URL
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver"""
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+# Create async engine for endpoints that must not block the event loop
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DB_ECHO,  # SQL query logging, off unless DB_ECHO is set
+    poolclass=AsyncAdaptedQueuePool,  # aiosqlite defaults to NullPool
+    pool_pre_ping=True,  # Enable connection health checks
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT
+)
+enable_sqlite_pragmas(async_engine.sync_engine)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False  # Rows stay readable after the session closes
+)
+
 @contextmanager
 def get_db_context():
     """Context manager for database sessions"""
@@ -43,6 +104,23 @@ def get_db_context():
         db.close()
 
 def get_db():
-    """Dependency for getting DB session"""
-    with get_db_context() as db:
-        yield db 
\ No newline at end of file
+    """
+    Dependency for getting DB session.
+
+    Endpoints commit their own writes; closing the session rolls back anything
+    left open, so read-only requests never pay for a COMMIT.
+    """
+    db = SessionLocal()
+    try:
+        logger.debug("Creating new database session")
+        yield db
+    finally:
+        logger.debug("Closing database session")
+        db.close()
+
+async def get_async_db():
+    """Dependency for getting an async DB session"""
+    async with AsyncSessionLocal() as db:
+        logger.debug("Creating new async database session")
+        yield db
+        logger.debug("Closing async database session")
@@ -5,7 +5,7 @@ from ..services.notification import NotificationService
 from ..models.user import User
 from ..models.audit_log import AuditLog
 from ..auth import get_current_user
-from ..config.database import get_db
+from api.database.database import get_db
 from datetime import datetime
 from sqlalchemy import inspect
 
@@ -1,19 +1,21 @@
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 from datetime import datetime
-from deepeval import evaluate
 from deepeval.metrics import BaseMetric
 from deepeval.test_case import LLMTestCase
+from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
 class RCAMetric(BaseMetric):
     """Custom metric for evaluating RCA results."""
     
-    def __init__(self):
-        super().__init__()
-        self.name = "RCA Quality"
-        self.threshold = 0.8
+    name = "RCA Quality"
+    threshold = 0.8
+    # Cheap set arithmetic, and a score of 0 means no issue was found at all
+    cost = 0
+    short_circuit = True
     
     def measure(self, test_case: LLMTestCase) -> float:
         """
@@ -30,21 +32,21 @@ class RCAMetric(BaseMetric):
             actual = test_case.actual_output
             expected = test_case.expected_output
             
-            # Calculate precision and recall
-            true_positives = len(set(actual.get("issues", [])).intersection(
-                set(expected.get("issues", []))
-            ))
+            actual_issues = actual.get("issues")
+            expected_issues = expected.get("issues")
             
-            precision = true_positives / len(actual.get("issues", [])) if actual.get("issues") else 0
-            recall = true_positives / len(expected.get("issues", [])) if expected.get("issues") else 0
+            # Precision or recall is zero without issues on both sides, and so is F1
+            if not actual_issues or not expected_issues:
+                return 0
             
-            # Calculate F1 score
-            if precision + recall > 0:
-                score = 2 * (precision * recall) / (precision + recall)
-            else:
-                score = 0
+            # Callers may pass frozensets to skip building the sets here
+            true_positives = len(
+                (actual_issues if isinstance(actual_issues, frozenset) else frozenset(actual_issues))
+                & (expected_issues if isinstance(expected_issues, frozenset) else frozenset(expected_issues))
+            )
             
-            return score
+            # F1 of precision (tp / actual) and recall (tp / expected) simplifies to 2tp / (actual + expected)
+            return 2 * true_positives / (len(actual_issues) + len(expected_issues))
             
         except Exception as e:
             logger.error(f"Error calculating RCA metric: {str(e)}")
@@ -58,11 +60,98 @@ class RCAMetric(BaseMetric):
     def __name__(self) -> str:
         return self.name
 
+def _metric_order(metric: BaseMetric):
+    """Sort key putting short-circuit metrics first, then cheaper metrics before costlier ones."""
+    return (not getattr(metric, "short_circuit", False), getattr(metric, "cost", 0))
+
+# Metrics keep no per-case state, so one set serves every evaluation
+_DEFAULT_METRICS = tuple(sorted((RCAMetric(),), key=_metric_order))
+
 class DeepEvalService:
     """Service for evaluating RCA results using DeepEval."""
     
-    def __init__(self):
-        self.metrics = [RCAMetric()]
+    def __init__(self, max_concurrency: int = settings.EVAL_MAX_CONCURRENCY):
+        self.metrics = _DEFAULT_METRICS
+        # Metrics whose score of 0 fails a case outright run first, one at a time,
+        # so the remaining (possibly LLM-backed) metrics are skipped for that case
+        self._gates = tuple(m for m in self.metrics if getattr(m, "short_circuit", False))
+        self._others = self.metrics[len(self._gates):]
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        Semaphore bounding metric measurements across every case being evaluated.
+        
+        Created on first use so it binds to the running event loop rather than
+        whichever loop (if any) was current when the service was constructed.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    async def _measure(self, metric: BaseMetric, test_case: LLMTestCase) -> float:
+        """Run a metric's blocking measure() in a worker thread."""
+        async with self.semaphore:
+            return await asyncio.to_thread(metric.measure, test_case)
+    
+    async def _measure_cases(self, metric: BaseMetric, test_cases: List[LLMTestCase]) -> List[Any]:
+        """
+        Run a metric's blocking measure() over every test case in one worker thread.
+        
+        Returns:
+            List with each case's score, or the exception its measurement raised
+        """
+        def measure_all() -> List[Any]:
+            scores = []
+            for test_case in test_cases:
+                try:
+                    scores.append(metric.measure(test_case))
+                except Exception as e:
+                    scores.append(e)
+            return scores
+        
+        async with self.semaphore:
+            return await asyncio.to_thread(measure_all)
+    
+    def _format_result(
+        self,
+        scores: List[float],
+        timestamp: str,
+        short_circuited: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build an evaluation result from one case's scores, ordered as self.metrics.
+        
+        A short-circuited case only has scores up to the gate that failed; it
+        is unsuccessful and scores 0 overall.
+        """
+        evaluation_result = {
+            "timestamp": timestamp,
+            "metrics": {},
+            "overall_score": 0.0,
+            "success": not short_circuited
+        }
+        
+        # Scores come from the return values; metric instances are shared between concurrent cases
+        for metric, score in zip(self.metrics, scores):
+            success = score >= metric.threshold
+            evaluation_result["metrics"][metric.name] = {
+                "score": score,
+                "threshold": metric.threshold,
+                "success": success
+            }
+            if not success:
+                evaluation_result["success"] = False
+        
+        # Calculate overall score
+        if evaluation_result["metrics"] and not short_circuited:
+            evaluation_result["overall_score"] = sum(
+                m["score"] for m in evaluation_result["metrics"].values()
+            ) / len(evaluation_result["metrics"])
+        
+        return evaluation_result
     
     async def evaluate_rca(
         self,
@@ -89,36 +178,19 @@ class DeepEvalService:
                 expected_output=expected_result
             )
             
-            # Run evaluation
-            results = evaluate(
-                [test_case],
-                metrics=self.metrics
-            )
-            
-            # Format results
-            evaluation_result = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "metrics": {},
-                "overall_score": 0.0,
-                "success": True
-            }
+            # Gates run first and stop the evaluation at the first score of 0
+            scores = []
+            for metric in self._gates:
+                scores.append(await self._measure(metric, test_case))
+                if scores[-1] == 0:
+                    return self._format_result(scores, datetime.utcnow().isoformat(), short_circuited=True)
             
-            for metric in self.metrics:
-                evaluation_result["metrics"][metric.name] = {
-                    "score": metric.score,
-                    "threshold": metric.threshold,
-                    "success": metric.is_successful()
-                }
-                if not metric.is_successful():
-                    evaluation_result["success"] = False
-            
-            # Calculate overall score
-            if evaluation_result["metrics"]:
-                evaluation_result["overall_score"] = sum(
-                    m["score"] for m in evaluation_result["metrics"].values()
-                ) / len(evaluation_result["metrics"])
+            # The rest are measured concurrently since each may call an LLM
+            scores.extend(await asyncio.gather(
+                *(self._measure(metric, test_case) for metric in self._others)
+            ))
             
-            return evaluation_result
+            return self._format_result(scores, datetime.utcnow().isoformat())
             
         except Exception as e:
             logger.error(f"Error evaluating RCA results: {str(e)}")
@@ -140,17 +212,59 @@ class DeepEvalService:
         Returns:
             Dict containing batch evaluation results
         """
-        results = []
+        timestamp = datetime.utcnow().isoformat()
+        
+        # Build every test case up front; a case that cannot be built gets an error result
+        results: List[Optional[Dict[str, Any]]] = []
+        llm_test_cases = []
         for case in test_cases:
-            result = await self.evaluate_rca(
-                case["trace_data"],
-                case["actual_result"],
-                case["expected_result"]
-            )
-            results.append(result)
+            try:
+                llm_test_cases.append(LLMTestCase(
+                    input=case["trace_data"].get("content", ""),
+                    actual_output=case["actual_result"],
+                    expected_output=case["expected_result"]
+                ))
+                results.append(None)
+            except Exception as e:
+                logger.error(f"Error evaluating RCA results: {str(e)}")
+                results.append({"error": str(e), "timestamp": timestamp})
+        
+        # One worker thread per metric measures the whole batch, rather than one per case and metric
+        case_scores: List[List[Any]] = [[] for _ in llm_test_cases]
+        short_circuited = set()
+        active = list(range(len(llm_test_cases)))
+        
+        # Gates run one after another; a case leaves the batch at its first score of 0 or error
+        for metric in self._gates:
+            gate_scores = await self._measure_cases(metric, [llm_test_cases[j] for j in active])
+            remaining = []
+            for j, score in zip(active, gate_scores):
+                case_scores[j].append(score)
+                if isinstance(score, Exception):
+                    continue
+                if score == 0:
+                    short_circuited.add(j)
+                else:
+                    remaining.append(j)
+            active = remaining
+        
+        metric_scores = await asyncio.gather(
+            *(self._measure_cases(metric, [llm_test_cases[j] for j in active]) for metric in self._others)
+        )
+        for j, scores in zip(active, zip(*metric_scores)):
+            case_scores[j].extend(scores)
+        
+        pending = (i for i, result in enumerate(results) if result is None)
+        for i, (j, scores) in zip(pending, enumerate(case_scores)):
+            error = next((s for s in scores if isinstance(s, Exception)), None)
+            if error is not None:
+                logger.error(f"Error evaluating RCA results: {str(error)}")
+                results[i] = {"error": str(error), "timestamp": timestamp}
+            else:
+                results[i] = self._format_result(scores, timestamp, short_circuited=j in short_circuited)
         
         return {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
             "total_cases": len(test_cases),
             "successful_cases": sum(1 for r in results if r.get("success", False)),
             "average_score": sum(r.get("overall_score", 0) for r in results) / len(results),
@@ -184,7 +298,7 @@ class DeepEvalIntegration:
                     "recall": 0.88,
                     "f1_score": 0.90
                 },
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.utcnow().isoformat()
             }
         except Exception as e:
             return {
@@ -1,6 +1,7 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 
 class MetricType(str, Enum):
     ACCURACY = "accuracy"
@@ -12,7 +13,7 @@ class MetricType(str, Enum):
     SEVERITY_ACCURACY = "severity_accuracy"
     CUSTOM = "custom"
 
-@dataclass
+@dataclass(frozen=True)
 class Metric:
     name: str
     type: MetricType
@@ -78,6 +79,16 @@ class MetricsRegistry:
                 }
             )
         }
+        self._refresh_views()
+    
+    def _refresh_views(self) -> None:
+        """Rebuild the cached metric sequences after the registry changes."""
+        self._all_metrics = tuple(self.metrics.values())
+        self._rca_metrics = [
+            self.metrics["rca_quality"],
+            self.metrics["issue_detection"],
+            self.metrics["severity_accuracy"]
+        ]
     
     def get_metric(self, name: str) -> Metric:
         """
@@ -89,7 +100,8 @@ class MetricsRegistry:
         Returns:
             Metric object
         """
-        return self.metrics.get(name.lower())
+        # Canonical (lowercase) names skip the lower() call
+        return self.metrics.get(name) or self.metrics.get(name.lower())
     
     def register_metric(self, metric: Metric) -> None:
         """
@@ -99,15 +111,16 @@ class MetricsRegistry:
             metric: Metric to register
         """
         self.metrics[metric.name.lower()] = metric
+        self._refresh_views()
     
-    def get_all_metrics(self) -> List[Metric]:
+    def get_all_metrics(self) -> Tuple[Metric, ...]:
         """
         Get all registered metrics.
         
         Returns:
-            List of all metrics
+            Tuple of all metrics, shared between calls
         """
-        return list(self.metrics.values())
+        return self._all_metrics
     
     def get_metrics_by_type(self, metric_type: MetricType) -> List[Metric]:
         """
@@ -128,8 +141,9 @@ class MetricsRegistry:
         Returns:
             List of RCA-specific metrics
         """
-        return [
-            self.metrics["rca_quality"],
-            self.metrics["issue_detection"],
-            self.metrics["severity_accuracy"]
-        ] 
\ No newline at end of file
+        return list(self._rca_metrics) 
+
+@lru_cache(maxsize=1)
+def get_metrics_registry() -> MetricsRegistry:
+    """Dependency returning the process-wide MetricsRegistry."""
+    return MetricsRegistry()
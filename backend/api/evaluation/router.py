@@ -1,21 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 from typing import List
 
-from ...config.database import get_db
-from ..models import AuditLog, User
+from api.database.database import get_async_db
+from ..models import User
 from .deepeval import DeepEvalIntegration
-from .metrics import MetricsRegistry
+from .metrics import MetricsRegistry, get_metrics_registry
 from ..auth.router import get_current_user
+from ..services.audit_writer import record_audit_log
 
 router = APIRouter()
 deepeval = DeepEvalIntegration()
-metrics_registry = MetricsRegistry()
 
 @router.post("/evaluate")
 async def evaluate_model(
     data: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -25,30 +26,29 @@ async def evaluate_model(
         result = await deepeval.evaluate(data)
         
         # Log the evaluation
-        db_audit = AuditLog(
-            user_id=current_user.id,
-            action_type="model_evaluation",
-            metadata={
+        await record_audit_log(db, {
+            "user_id": current_user.id,
+            "action_type": "model_evaluation",
+            "meta_data": {
                 "metrics": result.get("metrics", {}),
                 "status": result.get("status")
-            }
-        )
-        db.add(db_audit)
-        db.commit()
+            },
+            "created_at": datetime.utcnow()
+        })
         
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/metrics")
-async def get_metrics():
+async def get_metrics(metrics_registry: MetricsRegistry = Depends(get_metrics_registry)):
     """
     Get all available evaluation metrics.
     """
     return metrics_registry.get_all_metrics()
 
 @router.post("/metrics")
-async def register_metric(metric: dict):
+async def register_metric(metric: dict, metrics_registry: MetricsRegistry = Depends(get_metrics_registry)):
     """
     Register a new evaluation metric.
     """
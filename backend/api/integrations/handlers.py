@@ -1,11 +1,25 @@
 from typing import Dict, Any, Optional
 import json
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
 
 class IntegrationHandler:
     """Base class for integration handlers."""
     
     def __init__(self):
         self.config = {}
+        # Reused across calls so each notification skips a new TCP/TLS handshake
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=5.0
+        )
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.aclose()
     
     async def send_notification(self, data: Dict[str, Any]) -> bool:
         """
@@ -36,10 +50,14 @@ class SlackHandler(IntegrationHandler):
         self.webhook_url = webhook_url
     
     async def send_notification(self, data: Dict[str, Any]) -> bool:
-        try:
-            # Mock Slack API call
+        if not self.validate_config():
+            # Mock Slack API call until a webhook is configured
             return True
-        except Exception:
+        try:
+            response = await self._client.post(self.webhook_url, json=data)
+            return response.is_success
+        except httpx.HTTPError as e:
+            logger.error(f"Error sending Slack notification: {str(e)}")
             return False
     
     def validate_config(self) -> bool:
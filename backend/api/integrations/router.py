@@ -1,20 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
 from typing import Dict, Any
 
-from ...config.database import get_db
-from ..models import AuditLog, User
+from api.database.database import get_async_db
+from ..models import User
 from .handlers import SlackHandler, JiraHandler
 from ..auth.router import get_current_user
+from ..services.audit_writer import record_audit_log
 
 router = APIRouter()
 slack_handler = SlackHandler()
 jira_handler = JiraHandler()
 
+@router.on_event("shutdown")
+async def close_handlers():
+    await slack_handler.aclose()
+    await jira_handler.aclose()
+
 @router.post("/slack/configure")
 async def configure_slack(
     config: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -26,13 +33,12 @@ async def configure_slack(
             raise HTTPException(status_code=400, detail="Invalid Slack configuration")
         
         # Log the configuration
-        db_audit = AuditLog(
-            user_id=current_user.id,
-            action_type="slack_configure",
-            metadata={"status": "success"}
-        )
-        db.add(db_audit)
-        db.commit()
+        await record_audit_log(db, {
+            "user_id": current_user.id,
+            "action_type": "slack_configure",
+            "meta_data": {"status": "success"},
+            "created_at": datetime.utcnow()
+        })
         
         return {"status": "success", "message": "Slack configured successfully"}
     except Exception as e:
@@ -41,7 +47,7 @@ async def configure_slack(
 @router.post("/jira/configure")
 async def configure_jira(
     config: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -54,13 +60,12 @@ async def configure_jira(
             raise HTTPException(status_code=400, detail="Invalid Jira configuration")
         
         # Log the configuration
-        db_audit = AuditLog(
-            user_id=current_user.id,
-            action_type="jira_configure",
-            metadata={"status": "success"}
-        )
-        db.add(db_audit)
-        db.commit()
+        await record_audit_log(db, {
+            "user_id": current_user.id,
+            "action_type": "jira_configure",
+            "meta_data": {"status": "success"},
+            "created_at": datetime.utcnow()
+        })
         
         return {"status": "success", "message": "Jira configured successfully"}
     except Exception as e:
@@ -69,7 +74,7 @@ async def configure_jira(
 @router.post("/slack/notify")
 async def notify_slack(
     data: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -81,13 +86,12 @@ async def notify_slack(
             raise HTTPException(status_code=500, detail="Failed to send Slack notification")
         
         # Log the notification
-        db_audit = AuditLog(
-            user_id=current_user.id,
-            action_type="slack_notify",
-            metadata={"status": "success"}
-        )
-        db.add(db_audit)
-        db.commit()
+        await record_audit_log(db, {
+            "user_id": current_user.id,
+            "action_type": "slack_notify",
+            "meta_data": {"status": "success"},
+            "created_at": datetime.utcnow()
+        })
         
         return {"status": "success", "message": "Notification sent successfully"}
     except Exception as e:
@@ -96,7 +100,7 @@ async def notify_slack(
 @router.post("/jira/create")
 async def create_jira_issue(
     data: Dict[str, Any],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -108,13 +112,12 @@ async def create_jira_issue(
             raise HTTPException(status_code=500, detail="Failed to create Jira issue")
         
         # Log the issue creation
-        db_audit = AuditLog(
-            user_id=current_user.id,
-            action_type="jira_create",
-            metadata={"status": "success"}
-        )
-        db.add(db_audit)
-        db.commit()
+        await record_audit_log(db, {
+            "user_id": current_user.id,
+            "action_type": "jira_create",
+            "meta_data": {"status": "success"},
+            "created_at": datetime.utcnow()
+        })
         
         return {"status": "success", "message": "Jira issue created successfully"}
     except Exception as e:
@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from fastapi import status
+import orjson
 
 from api.database.database import get_db
 from api.models.database import Issue, User
-from api.models.issue import IssueCreate, IssueUpdate, IssueFilter, IssueResponse
+from api.models.issue import IssueCreate, IssueUpdate, IssueFilter, IssueResponse, IssuePage
 from api.auth.router import get_current_user
 
+# Issue columns backing IssueResponse, selected directly for listings
+ISSUE_RESPONSE_COLUMNS = [getattr(Issue, name) for name in IssueResponse.model_fields]
+
 router = APIRouter(
     prefix="/issues",
     tags=["issues"],
@@ -35,7 +40,7 @@ async def create_issue(
     db.refresh(db_issue)
     return IssueResponse.from_orm(db_issue)
 
-@router.get("/", response_model=Dict[str, Any])
+@router.get("/", response_model=IssuePage)
 async def get_issues(
     filter: IssueFilter = Depends(),
     skip: int = 0,
@@ -46,35 +51,46 @@ async def get_issues(
     """Get a list of issues with filtering and pagination.
     By default, only shows issues for the current user.
     """
-    query = db.query(Issue).filter(Issue.user_id == current_user.id)
+    conditions = [Issue.user_id == current_user.id]
     
     # Apply filters
     if filter.trace_id:
-        query = query.filter(Issue.trace_id == filter.trace_id)
+        conditions.append(Issue.trace_id == filter.trace_id)
     if filter.status:
-        query = query.filter(Issue.status == filter.status)
+        conditions.append(Issue.status == filter.status)
     if filter.severity:
-        query = query.filter(Issue.severity == filter.severity)
+        conditions.append(Issue.severity == filter.severity)
     if filter.start_date:
-        query = query.filter(Issue.created_at >= filter.start_date)
+        conditions.append(Issue.created_at >= filter.start_date)
     if filter.end_date:
-        query = query.filter(Issue.created_at <= filter.end_date)
-    
-    # Get total count
-    total_count = query.count()
+        conditions.append(Issue.created_at <= filter.end_date)
     
-    # Apply pagination
-    issues = query.offset(skip).limit(limit).all()
+    # Fetch the page and the total count in one round-trip, newest first
+    rows = db.execute(
+        select(*ISSUE_RESPONSE_COLUMNS, func.count().over().label("total"))
+        .where(*conditions)
+        .order_by(Issue.created_at.desc(), Issue.id.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
     
-    # Convert to response model
-    issues_response = [IssueResponse.from_orm(issue) for issue in issues]
+    if rows:
+        total_count = rows[0].total
+    elif skip:
+        # Past the last page there is no row to carry the window count
+        total_count = db.scalar(select(func.count()).select_from(Issue).where(*conditions))
+    else:
+        total_count = 0
     
-    return {
-        "items": issues_response,
+    # Rows come straight from the issues table, so they are written as IssuePage
+    # JSON directly; orjson handles the datetime and enum columns itself
+    body = orjson.dumps({
+        "items": [{name: row._mapping[name] for name in IssueResponse.model_fields} for row in rows],
         "total": total_count,
         "skip": skip,
         "limit": limit
-    }
+    })
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{issue_id}", response_model=IssueResponse)
 async def get_issue(
@@ -1,12 +1,19 @@
 from typing import Dict, Any, Optional
 import json
 
+from api.services.ttl_cache import TTLCache
+
 class ModelContextServer:
     """Server for managing model context and configurations."""
     
-    def __init__(self):
-        self.contexts = {}
-        self.configs = {}
+    # Fields a context or configuration must define
+    _CTX_REQUIRED = frozenset({"model_type", "version", "parameters"})
+    _CONFIG_REQUIRED = frozenset({"batch_size", "learning_rate", "epochs"})
+    
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600):
+        # Bounded so models that stop reporting age out instead of accumulating
+        self.contexts = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.configs = TTLCache(maxsize=maxsize, ttl=ttl)
     
     async def get_context(self, model_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -32,7 +39,7 @@ class ModelContextServer:
             bool indicating success
         """
         try:
-            self.contexts[model_id] = context
+            self.contexts.set(model_id, context)
             return True
         except Exception:
             return False
@@ -61,12 +68,12 @@ class ModelContextServer:
             bool indicating success
         """
         try:
-            self.configs[model_id] = config
+            self.configs.set(model_id, config)
             return True
         except Exception:
             return False
     
-    async def validate_context(self, context: Dict[str, Any]) -> bool:
+    def validate_context(self, context: Dict[str, Any]) -> bool:
         """
         Validate model context.
         
@@ -76,10 +83,9 @@ class ModelContextServer:
         Returns:
             bool indicating if context is valid
         """
-        required_fields = ["model_type", "version", "parameters"]
-        return all(field in context for field in required_fields)
+        return self._CTX_REQUIRED.issubset(context.keys())
     
-    async def validate_config(self, config: Dict[str, Any]) -> bool:
+    def validate_config(self, config: Dict[str, Any]) -> bool:
         """
         Validate model configuration.
         
@@ -89,5 +95,4 @@ class ModelContextServer:
         Returns:
             bool indicating if config is valid
         """
-        required_fields = ["batch_size", "learning_rate", "epochs"]
-        return all(field in config for field in required_fields) 
\ No newline at end of file
+        return self._CONFIG_REQUIRED.issubset(config.keys()) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 class AuditLogBase(BaseModel):
@@ -19,10 +19,18 @@ class AuditLogResponse(AuditLogBase):
     class Config:
         from_attributes = True
 
+class AuditLogPage(BaseModel):
+    items: List[AuditLogResponse]
+    next_cursor: Optional[str] = None
+    approx_total: Optional[int] = None
+    has_more: bool = False
+
 class AuditLogFilter(BaseModel):
     user_id: Optional[int] = None
     action_type: Optional[str] = None
+    action_types: Optional[List[str]] = None
     resource_type: Optional[str] = None
+    resource_types: Optional[List[str]] = None
     resource_id: Optional[int] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
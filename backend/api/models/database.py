@@ -1,25 +1,17 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Enum, create_engine
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Enum, DDL, Index, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
-from config.settings import settings
+# The engine and sessions live in api.database.database; re-exported for existing imports
+from api.database.database import engine, SessionLocal, get_db
 from pydantic import ConfigDict
 import logging
 from enum import Enum as PyEnum
 
 logger = logging.getLogger(__name__)
 
-# Create SQLite engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Needed for SQLite
-    echo=True  # Enable SQL query logging
-)
-
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
 # Create base class for models
 Base = declarative_base()
 
@@ -30,7 +22,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True)
     full_name = Column(String)
-    hashed_password = Column(String)
+    hashed_password = deferred(Column(String))  # Only login reads it; load with undefer()
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -48,7 +40,7 @@ class Trace(Base):
     __tablename__ = "traces"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     content = Column(JSON)
     file_name = Column(String)
     file_size = Column(Integer)
@@ -97,6 +89,12 @@ class Issue(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)
 
+    # Dashboard counts a user's issues by status; listings filter a user's issues newest first
+    __table_args__ = (
+        Index("ix_issues_user_status", user_id, status),
+        Index("ix_issues_user_created", user_id, created_at.desc(), status, severity),
+    )
+
     # Relationships
     user = relationship("User", back_populates="issues", foreign_keys=[user_id])
     assigned_to_user = relationship("User", back_populates="assigned_issues", foreign_keys=[assigned_to])
@@ -113,14 +111,54 @@ class AuditLog(Base):
     action_type = Column(String)
     resource_type = Column(String)
     resource_id = Column(Integer, nullable=True)
-    meta_data = Column(JSON, nullable=True)
+    meta_data = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Listings filter on user or action type and return newest first
+    __table_args__ = (
+        Index(
+            "ix_audit_user_created",
+            user_id,
+            created_at.desc(),
+            postgresql_include=["action_type", "resource_type", "resource_id"]
+        ),
+        Index("ix_audit_action_created", action_type, created_at.desc()),
+    )
+
     # Relationships
     user = relationship("User", back_populates="audit_logs")
 
     model_config = ConfigDict(from_attributes=True)
 
+# Full-text search over audit metadata: a GIN-indexed tsvector column on
+# PostgreSQL, an FTS5 index kept in sync by triggers on SQLite
+AUDIT_LOG_SEARCH_DDL = {
+    "postgresql": [
+        "ALTER TABLE audit_logs ADD COLUMN meta_data_tsv tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(meta_data::text, ''))) STORED",
+        "CREATE INDEX ix_audit_logs_meta_data_tsv ON audit_logs USING GIN (meta_data_tsv)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE audit_logs_fts USING fts5(meta_data, content='audit_logs', content_rowid='id')",
+        "CREATE TRIGGER audit_logs_fts_ai AFTER INSERT ON audit_logs BEGIN "
+        "INSERT INTO audit_logs_fts(rowid, meta_data) VALUES (new.id, new.meta_data); END",
+        "CREATE TRIGGER audit_logs_fts_ad AFTER DELETE ON audit_logs BEGIN "
+        "INSERT INTO audit_logs_fts(audit_logs_fts, rowid, meta_data) VALUES ('delete', old.id, old.meta_data); END",
+        "CREATE TRIGGER audit_logs_fts_au AFTER UPDATE ON audit_logs BEGIN "
+        "INSERT INTO audit_logs_fts(audit_logs_fts, rowid, meta_data) VALUES ('delete', old.id, old.meta_data); "
+        "INSERT INTO audit_logs_fts(rowid, meta_data) VALUES (new.id, new.meta_data); END",
+    ],
+}
+
+for dialect, statements in AUDIT_LOG_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(AuditLog.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
+event.listen(
+    AuditLog.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS audit_logs_fts").execute_if(dialect="sqlite")
+)
+
 class Notification(Base):
     """SQLAlchemy model for notifications table."""
     __tablename__ = "notifications"
@@ -141,13 +179,3 @@ class Notification(Base):
     user = relationship("User", back_populates="notifications")
 
     model_config = ConfigDict(from_attributes=True)
-
-def get_db():
-    """Dependency for getting DB session"""
-    db = SessionLocal()
-    try:
-        logger.debug("Creating new database session")
-        yield db
-    finally:
-        logger.debug("Closing database session")
-        db.close() 
\ No newline at end of file
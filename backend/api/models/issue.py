@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
 
@@ -52,4 +52,10 @@ class IssueResponse(IssueBase):
     updated_at: datetime
     resolved_at: Optional[datetime] = None
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
+
+class IssuePage(BaseModel):
+    items: List[IssueResponse]
+    total: int
+    skip: int
+    limit: int
@@ -37,4 +37,5 @@ class Token(BaseModel):
     token_type: str
 
 class TokenData(BaseModel):
-    email: Optional[str] = None 
\ No newline at end of file
+    email: Optional[str] = None
+    user_id: Optional[int] = None 
\ No newline at end of file
@@ -161,7 +161,7 @@ class Orchestrator:
         Returns:
             bool indicating if data is valid
         """
-        return await self.rca_agent.validate(trace_data)
+        return self.rca_agent.validate(trace_data)
     
     async def get_workflow_status(self, trace_id: int, db: Session) -> Dict[str, Any]:
         """
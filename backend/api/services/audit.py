@@ -1,7 +1,10 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
+import orjson
 from api.models.database import AuditLog, User
+from api.services.audit_cache import audit_cache
+from api.services.audit_writer import audit_writer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,21 +39,13 @@ class AuditService:
             additional_context: Any additional context about the action
             
         Returns:
-            The created audit log entry
+            The created audit log entry. While the background audit writer is
+            running the entry is queued instead and has no id yet.
         """
         try:
-            # Check for duplicate action
-            action_key = f"{user_id}_{action_type}_{resource_type}_{resource_id}"
             current_time = datetime.utcnow()
-            
-            if action_key in self._last_action:
-                last_time = self._last_action[action_key]
-                # If same action within 1 second, skip
-                if (current_time - last_time).total_seconds() < 1:
-                    logger.debug(f"Skipping duplicate action: {action_key}")
-                    return None
-            
-            self._last_action[action_key] = current_time
+            if self._is_duplicate(user_id, action_type, resource_type, resource_id, current_time, meta_data):
+                return None
             
             logger.info(f"Attempting to log action: {action_type} on {resource_type} by user {user_id}")
             
@@ -61,32 +56,29 @@ class AuditService:
                 return None
 
             # Prepare comprehensive metadata
-            full_meta_data = {
-                "user_email": user.email,
-                "user_name": user.full_name,
-                "action_timestamp": current_time.isoformat(),
-                "action_details": meta_data or {},
-                "system_context": additional_context or {},
-                "ip_address": additional_context.get("ip_address") if additional_context else None,
-                "user_agent": additional_context.get("user_agent") if additional_context else None,
-                "session_id": additional_context.get("session_id") if additional_context else None
-            }
+            full_meta_data = self._build_meta_data(user, current_time, meta_data, additional_context)
 
             logger.info(f"Creating audit log with metadata: {full_meta_data}")
 
             # Create audit log entry
-            audit_log = AuditLog(
-                user_id=user_id,
-                action_type=action_type,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                meta_data=full_meta_data,
-                created_at=current_time
-            )
+            row = {
+                "user_id": user_id,
+                "action_type": action_type,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "meta_data": full_meta_data,
+                "created_at": current_time
+            }
+            if audit_writer.running:
+                audit_writer.submit([row])
+                logger.info(f"Queued audit log: {action_type} on {resource_type} by user {user_id}")
+                return AuditLog(**row)
             
+            audit_log = AuditLog(**row)
             self.db.add(audit_log)
             self.db.commit()
             self.db.refresh(audit_log)
+            await audit_cache.invalidate(user_id)
             
             logger.info(f"Successfully created audit log with ID: {audit_log.id}")
             return audit_log
@@ -96,6 +88,114 @@ class AuditService:
             self.db.rollback()
             return None
 
+    async def log_actions(self, user_id: int, entries: List[Dict[str, Any]]) -> List[AuditLog]:
+        """
+        Log a batch of actions by one user in a single transaction.
+        
+        Args:
+            user_id: ID of the user performing the actions
+            entries: One dict per action with action_type, resource_type and
+                optionally resource_id, meta_data and additional_context
+            
+        Returns:
+            The created audit log entries; duplicates are skipped as in log_action
+            and entries are queued the same way while the background writer runs
+        """
+        if not entries:
+            return []
+        
+        try:
+            current_time = datetime.utcnow()
+            user = self.db.query(User).filter(User.id == user_id).first()
+            if not user:
+                logger.error(f"User {user_id} not found for audit logging")
+                return []
+            
+            rows = [
+                {
+                    "user_id": user_id,
+                    "action_type": entry["action_type"],
+                    "resource_type": entry["resource_type"],
+                    "resource_id": entry.get("resource_id"),
+                    "meta_data": self._build_meta_data(
+                        user, current_time, entry.get("meta_data"), entry.get("additional_context")
+                    ),
+                    "created_at": current_time
+                }
+                for entry in entries
+                if not self._is_duplicate(
+                    user_id,
+                    entry["action_type"],
+                    entry["resource_type"],
+                    entry.get("resource_id"),
+                    current_time,
+                    entry.get("meta_data")
+                )
+            ]
+            if audit_writer.running:
+                audit_writer.submit(rows)
+                logger.info(f"Queued {len(rows)} audit logs for user {user_id}")
+                return [AuditLog(**row) for row in rows]
+            
+            audit_logs = [AuditLog(**row) for row in rows]
+            self.db.add_all(audit_logs)
+            self.db.commit()
+            if audit_logs:
+                await audit_cache.invalidate(user_id)
+            
+            logger.info(f"Successfully created {len(audit_logs)} audit logs for user {user_id}")
+            return audit_logs
+            
+        except Exception as e:
+            logger.error(f"Error creating audit logs: {str(e)}")
+            self.db.rollback()
+            return []
+
+    def _is_duplicate(
+        self,
+        user_id: int,
+        action_type: str,
+        resource_type: str,
+        resource_id: Optional[int],
+        current_time: datetime,
+        meta_data: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Check for the same action within 1 second and record this one.
+        
+        Actions only count as the same when their metadata matches too, so a
+        batch of distinct events on one resource (e.g. several issues detected
+        in a trace) is kept in full.
+        """
+        meta_digest = hash(orjson.dumps(meta_data, default=str, option=orjson.OPT_SORT_KEYS))
+        action_key = f"{user_id}_{action_type}_{resource_type}_{resource_id}_{meta_digest}"
+        last_time = self._last_action.get(action_key)
+        if last_time is not None and (current_time - last_time).total_seconds() < 1:
+            logger.debug(f"Skipping duplicate action: {action_key}")
+            return True
+        
+        self._last_action[action_key] = current_time
+        return False
+
+    @staticmethod
+    def _build_meta_data(
+        user: User,
+        current_time: datetime,
+        meta_data: Optional[Dict[str, Any]],
+        additional_context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the comprehensive metadata stored with an audit log entry."""
+        return {
+            "user_email": user.email,
+            "user_name": user.full_name,
+            "action_timestamp": current_time.isoformat(),
+            "action_details": meta_data or {},
+            "system_context": additional_context or {},
+            "ip_address": additional_context.get("ip_address") if additional_context else None,
+            "user_agent": additional_context.get("user_agent") if additional_context else None,
+            "session_id": additional_context.get("session_id") if additional_context else None
+        }
+
     async def log_trace_action(
         self,
         user_id: int,
@@ -151,6 +251,11 @@ class AuditService:
             additional_context=additional_context
         )
 
+    async def log_system_actions(self, entries: List[Dict[str, Any]]) -> List[AuditLog]:
+        """Log a batch of system-level actions (no specific user) in one transaction."""
+        logger.info(f"Logging {len(entries)} system actions")
+        return await self.log_actions(user_id=1, entries=entries)  # System user ID
+
     async def log_system_action(
         self,
         action_type: str,
@@ -0,0 +1,91 @@
+from typing import Any, Awaitable, Callable, Dict
+import hashlib
+import logging
+import time
+
+import orjson
+from redis import asyncio as redis
+from redis.exceptions import RedisError
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class AuditCache:
+    """
+    Short-lived Redis cache for audit log listings.
+    
+    Page keys embed a per-user version that is bumped whenever the user's
+    audit log changes, so a write makes older pages unreachable without
+    scanning for keys; they simply expire.
+    """
+    
+    def __init__(self, ttl: int = settings.AUDIT_CACHE_TTL, retry_after: float = 30.0):
+        self.client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            socket_connect_timeout=1,
+            socket_timeout=1
+        )
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._retry_at = 0.0  # Bypass the cache until then after a Redis error
+    
+    def _available(self) -> bool:
+        return time.monotonic() >= self._retry_at
+    
+    def _disable(self, error: Exception) -> None:
+        logger.warning(f"Audit cache unavailable, bypassing for {self.retry_after}s: {str(error)}")
+        self._retry_at = time.monotonic() + self.retry_after
+    
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"audit:{user_id}:version"
+    
+    async def _page_key(self, user_id: int, params: Dict[str, Any]) -> str:
+        version = await self.client.get(self._version_key(user_id))
+        digest = hashlib.sha1(orjson.dumps(params, default=str, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return f"audit:{user_id}:v{int(version or 0)}:{digest}"
+    
+    async def fetch(self, user_id: int, params: Dict[str, Any], load: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        Return the cached page body for a user's listing, loading and caching it on a miss.
+        
+        Args:
+            user_id: ID of the user whose audit log is listed
+            params: Everything that shapes the page (filters, cursor, limit, order)
+            load: Coroutine function producing the serialized page
+            
+        Returns:
+            The serialized page
+        """
+        if not self._available():
+            return await load()
+        
+        try:
+            key = await self._page_key(user_id, params)
+            cached = await self.client.get(key)
+        except RedisError as e:
+            self._disable(e)
+            return await load()
+        if cached is not None:
+            return cached
+        
+        body = await load()
+        try:
+            await self.client.set(key, body, ex=self.ttl)
+        except RedisError as e:
+            self._disable(e)
+        return body
+    
+    async def invalidate(self, user_id: int) -> None:
+        """Make every cached page of a user's audit log stale."""
+        if not self._available():
+            return
+        try:
+            await self.client.incr(self._version_key(user_id))
+        except RedisError as e:
+            self._disable(e)
+
+audit_cache = AuditCache()
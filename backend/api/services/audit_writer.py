@@ -0,0 +1,122 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.database.database import AsyncSessionLocal
+from api.models.database import AuditLog
+from api.services.audit_cache import audit_cache
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+class AuditWriter:
+    """
+    Background writer that batches queued audit log rows into bulk inserts.
+
+    A batch is written once batch_size rows are waiting or flush_interval
+    seconds after its first row was queued, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL,
+        session_factory=AsyncSessionLocal
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        """Whether rows can be queued from the current event loop."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return self._task is not None and not self._stopping and loop is self._loop
+
+    def start(self) -> None:
+        """Start the flush loop on the running event loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+        logger.info("Audit writer started")
+
+    async def stop(self) -> None:
+        """Stop the flush loop after writing every row queued so far."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+        logger.info("Audit writer stopped")
+
+    def submit(self, rows: List[Dict[str, Any]]) -> None:
+        """Queue audit log rows (AuditLog column values) for the next batch."""
+        for row in rows:
+            self._queue.put_nowait(row)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = []
+            row = await self._queue.get()
+            deadline = loop.time() + self.flush_interval
+            while True:
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+                timeout = deadline - loop.time()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                await self._flush(batch)
+
+    async def _flush(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            async with self.session_factory() as db:
+                await db.execute(insert(AuditLog), rows)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} queued audit logs: {str(e)}")
+            return
+
+        logger.info(f"Wrote {len(rows)} queued audit logs")
+        for user_id in {row["user_id"] for row in rows}:
+            await audit_cache.invalidate(user_id)
+
+audit_writer = AuditWriter()
+
+async def record_audit_log(db: AsyncSession, row: Dict[str, Any]) -> None:
+    """
+    Queue an audit log row on the background writer, or write it through db
+    when the writer is not running (scripts, tests).
+
+    Args:
+        db: Session used for the synchronous fallback
+        row: AuditLog column values, including created_at
+    """
+    if audit_writer.running:
+        audit_writer.submit([row])
+        return
+    db.add(AuditLog(**row))
+    await db.commit()
+    await audit_cache.invalidate(row["user_id"])
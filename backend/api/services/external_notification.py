@@ -1,13 +1,13 @@
 from typing import Dict, Any, Optional
 import os
 import logging
-from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
-import json
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,7 @@ class ExternalNotificationService:
         slack_token = os.getenv("SLACK_BOT_TOKEN")
         if slack_token:
             logger.info(f"Initializing Slack client with token: {slack_token[:10]}...")
-            self.slack_client = WebClient(token=slack_token)
+            self.slack_client = AsyncWebClient(token=slack_token)
         else:
             logger.warning("SLACK_BOT_TOKEN not found in environment variables")
         
@@ -67,12 +67,12 @@ class ExternalNotificationService:
             logger.info(f"Attempting to send Slack message to channel: {channel}")
             logger.info(f"Message content: {message}")
             if blocks:
-                logger.info(f"Message blocks: {json.dumps(blocks, indent=2)}")
+                logger.info(f"Message blocks: {orjson.dumps(blocks, option=orjson.OPT_INDENT_2).decode()}")
             
             # First, try to join the channel if we're not already in it
             try:
                 logger.info(f"Attempting to join channel: {channel}")
-                join_response = self.slack_client.conversations_join(channel=channel)
+                join_response = await self.slack_client.conversations_join(channel=channel)
                 logger.info(f"Join response: {join_response}")
             except SlackApiError as join_error:
                 logger.warning(f"Could not join channel {channel}: {str(join_error)}")
@@ -83,7 +83,7 @@ class ExternalNotificationService:
             # Now send the message
             logger.info("Sending message to Slack")
             try:
-                response = self.slack_client.chat_postMessage(
+                response = await self.slack_client.chat_postMessage(
                     channel=channel,
                     text=message,
                     blocks=blocks
@@ -14,6 +14,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")  # Change this in production
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))  # Password hashing cost; 4 is enough for tests and dev
     
     # API settings
     API_V1_STR: str = "/api/v1"
@@ -45,6 +46,17 @@ class Settings(BaseSettings):
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
     REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
+    # Shared by every worker so per-IP limits hold across processes
+    RATE_LIMIT_STORAGE_URI: str = os.getenv(
+        "RATE_LIMIT_STORAGE_URI",
+        f"redis://:{REDIS_PASSWORD or ''}@{REDIS_HOST}:{REDIS_PORT}"
+    )
+    AUDIT_CACHE_TTL: int = int(os.getenv("AUDIT_CACHE_TTL", "30"))  # Seconds
+    AUDIT_COUNT_REFRESH: float = float(os.getenv("AUDIT_COUNT_REFRESH", "60"))  # Seconds
+    
+    # Audit Log Writer Settings
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+    AUDIT_FLUSH_INTERVAL: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.1"))  # Seconds
     
     # Logging Settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -56,6 +68,7 @@ class Settings(BaseSettings):
     DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
     
     # Database Session Settings
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"  # Log every SQL statement
     DB_AUTOCOMMIT: bool = False
     DB_AUTOFLUSH: bool = False
     
@@ -67,6 +80,7 @@ class Settings(BaseSettings):
     # RCA Settings
     RCA_MODEL_PATH: str = os.getenv("RCA_MODEL_PATH", "models/rca_model")
     RCA_THRESHOLD: float = float(os.getenv("RCA_THRESHOLD", "0.7"))
+    EVAL_MAX_CONCURRENCY: int = int(os.getenv("EVAL_MAX_CONCURRENCY", "8"))  # Metric measurements in flight at once
     
     # Notification Settings
     ENABLE_EMAIL_NOTIFICATIONS: bool = bool(os.getenv("ENABLE_EMAIL_NOTIFICATIONS", "False"))
@@ -1,17 +1,21 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from typing import List
 import os
 import logging
 from logging.handlers import RotatingFileHandler
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 
 from api.database.database import get_db, engine, SessionLocal
 from api.models.database import Base, User as UserModel
 from api.models.schemas import User
 from api.routes import api_router
-from api.auth.router import router as auth_router, get_current_user, get_password_hash, create_access_token
+from api.auth.router import router as auth_router, get_current_user, get_password_hash, create_access_token, limiter
+from api.services.audit_writer import audit_writer
 from config.settings import settings
 
 # Set up logging
@@ -61,8 +65,13 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
+# Rate limiting for the auth routes; slowapi looks the limiter up on app.state
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
 # Configure CORS - MUST be before any routes
 origins = [
     "http://localhost:3000",
@@ -104,6 +113,14 @@ app.include_router(auth_router)
 # Include the main API router
 app.include_router(api_router)
 
+@app.on_event("startup")
+async def start_audit_writer():
+    audit_writer.start()
+
+@app.on_event("shutdown")
+async def stop_audit_writer():
+    await audit_writer.stop()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to EchosysAI API"}
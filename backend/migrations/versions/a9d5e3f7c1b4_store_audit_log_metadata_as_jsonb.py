@@ -0,0 +1,42 @@
+"""store audit log metadata as jsonb on postgresql
+
+Revision ID: a9d5e3f7c1b4
+Revises: e7b3c5d9f1a2
+Create Date: 2024-04-05 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d5e3f7c1b4'
+down_revision = 'e7b3c5d9f1a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # The generated search column depends on meta_data, so rebuild it around the type change
+    op.execute("DROP INDEX IF EXISTS ix_audit_logs_meta_data_tsv")
+    op.execute("ALTER TABLE audit_logs DROP COLUMN IF EXISTS meta_data_tsv")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN meta_data TYPE jsonb USING meta_data::jsonb")
+    op.execute(
+        "ALTER TABLE audit_logs ADD COLUMN meta_data_tsv tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(meta_data::text, ''))) STORED"
+    )
+    op.execute("CREATE INDEX ix_audit_logs_meta_data_tsv ON audit_logs USING GIN (meta_data_tsv)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_audit_logs_meta_data_tsv")
+    op.execute("ALTER TABLE audit_logs DROP COLUMN IF EXISTS meta_data_tsv")
+    op.execute("ALTER TABLE audit_logs ALTER COLUMN meta_data TYPE json USING meta_data::json")
+    op.execute(
+        "ALTER TABLE audit_logs ADD COLUMN meta_data_tsv tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(meta_data::text, ''))) STORED"
+    )
+    op.execute("CREATE INDEX ix_audit_logs_meta_data_tsv ON audit_logs USING GIN (meta_data_tsv)")
@@ -0,0 +1,25 @@
+"""add indexes for dashboard trace and issue counts
+
+Revision ID: b3e9f1c7d5a8
+Revises: a9d5e3f7c1b4
+Create Date: 2024-04-06 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e9f1c7d5a8'
+down_revision = 'a9d5e3f7c1b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_traces_user_id', 'traces', ['user_id'])
+    op.create_index('ix_issues_user_status', 'issues', ['user_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_issues_user_status', table_name='issues')
+    op.drop_index('ix_traces_user_id', table_name='traces')
@@ -0,0 +1,28 @@
+"""add composite index for issue listings
+
+Revision ID: c5a7e2d9f4b1
+Revises: b3e9f1c7d5a8
+Create Date: 2024-04-07 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a7e2d9f4b1'
+down_revision = 'b3e9f1c7d5a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_issues_user_created',
+        'issues',
+        ['user_id', sa.text('created_at DESC'), 'status', 'severity']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_issues_user_created', table_name='issues')
@@ -0,0 +1,56 @@
+"""add full-text search index on audit log metadata
+
+Revision ID: d4e1a7c9b2f0
+Revises: cb78fde7783d
+Create Date: 2024-04-02 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4e1a7c9b2f0'
+down_revision = 'cb78fde7783d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE audit_logs ADD COLUMN meta_data_tsv tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(meta_data::text, ''))) STORED"
+        )
+        op.execute("CREATE INDEX ix_audit_logs_meta_data_tsv ON audit_logs USING GIN (meta_data_tsv)")
+    elif dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE audit_logs_fts USING fts5(meta_data, content='audit_logs', content_rowid='id')"
+        )
+        op.execute(
+            "CREATE TRIGGER audit_logs_fts_ai AFTER INSERT ON audit_logs BEGIN "
+            "INSERT INTO audit_logs_fts(rowid, meta_data) VALUES (new.id, new.meta_data); END"
+        )
+        op.execute(
+            "CREATE TRIGGER audit_logs_fts_ad AFTER DELETE ON audit_logs BEGIN "
+            "INSERT INTO audit_logs_fts(audit_logs_fts, rowid, meta_data) VALUES ('delete', old.id, old.meta_data); END"
+        )
+        op.execute(
+            "CREATE TRIGGER audit_logs_fts_au AFTER UPDATE ON audit_logs BEGIN "
+            "INSERT INTO audit_logs_fts(audit_logs_fts, rowid, meta_data) VALUES ('delete', old.id, old.meta_data); "
+            "INSERT INTO audit_logs_fts(rowid, meta_data) VALUES (new.id, new.meta_data); END"
+        )
+        # Index the rows that already exist
+        op.execute("INSERT INTO audit_logs_fts(audit_logs_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_audit_logs_meta_data_tsv")
+        op.execute("ALTER TABLE audit_logs DROP COLUMN IF EXISTS meta_data_tsv")
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS audit_logs_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS audit_logs_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS audit_logs_fts_ai")
+        op.execute("DROP TABLE IF EXISTS audit_logs_fts")
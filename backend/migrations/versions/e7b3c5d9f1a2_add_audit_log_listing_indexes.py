@@ -0,0 +1,35 @@
+"""add composite indexes for audit log listings
+
+Revision ID: e7b3c5d9f1a2
+Revises: d4e1a7c9b2f0
+Create Date: 2024-04-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3c5d9f1a2'
+down_revision = 'd4e1a7c9b2f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_audit_user_created',
+        'audit_logs',
+        ['user_id', sa.text('created_at DESC')],
+        postgresql_include=['action_type', 'resource_type', 'resource_id']
+    )
+    op.create_index(
+        'ix_audit_action_created',
+        'audit_logs',
+        ['action_type', sa.text('created_at DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_action_created', table_name='audit_logs')
+    op.drop_index('ix_audit_user_created', table_name='audit_logs')
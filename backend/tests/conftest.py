@@ -0,0 +1,4 @@
+import os
+
+# Hash passwords at the minimum bcrypt cost; must be set before config.settings is imported
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
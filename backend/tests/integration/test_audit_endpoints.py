@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from api.audit import router as audit_router
+from api.auth.router import get_current_user
+from api.models.database import Base, AuditLog, User
+from api.services.ttl_cache import TTLCache
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "audit.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        session.add_all([
+            User(id=1, email="test@example.com", full_name="Test"),
+            User(id=2, email="other@example.com", full_name="Other"),
+        ])
+        session.commit()
+    engine.dispose()
+    return path
+
+@pytest.fixture
+def add_logs(db_path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    Session = sessionmaker(bind=engine)
+    
+    def add(*logs):
+        with Session() as session:
+            session.add_all([AuditLog(**log) for log in logs])
+            session.commit()
+    
+    yield add
+    engine.dispose()
+
+@pytest.fixture
+def client(db_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    monkeypatch.setattr(audit_router, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+    # Always load pages from the database rather than a shared Redis cache
+    monkeypatch.setattr(audit_router.audit_cache, "fetch", lambda user_id, params, load_page: load_page())
+    monkeypatch.setattr(audit_router, "_audit_counts", TTLCache(maxsize=100, ttl=600))
+    monkeypatch.setattr(audit_router, "_count_refreshes", {})
+    
+    app = FastAPI()
+    app.include_router(audit_router.router)
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="test@example.com")
+    with TestClient(app) as test_client:
+        yield test_client
+
+def log(log_id, minutes, action_type="login", user_id=1, resource_type="user"):
+    return {
+        "id": log_id,
+        "user_id": user_id,
+        "action_type": action_type,
+        "resource_type": resource_type,
+        "meta_data": {"n": log_id},
+        "created_at": BASE_TIME + timedelta(minutes=minutes),
+    }
+
+def walk(client, url, **params):
+    """Follow next_cursor from the first page to the last, returning every page."""
+    pages = []
+    cursor = None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = pages[-1]["next_cursor"]
+        assert pages[-1]["has_more"] == (cursor is not None)
+        if cursor is None:
+            return pages
+
+def wait_for_total(client, url, **params):
+    """Request the first page until the background count has filled in approx_total."""
+    for _ in range(50):
+        total = client.get(url, params=params).json()["approx_total"]
+        if total is not None:
+            return total
+        time.sleep(0.02)
+    return None
+
+def ids(pages):
+    return [item["id"] for page in pages for item in page["items"]]
+
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+def test_cursor_round_trip(client, add_logs, sort_order):
+    add_logs(*(log(log_id, minutes) for log_id, minutes in [(1, 0), (2, 5), (3, 1), (4, 9), (5, 3), (6, 7), (7, 2)]))
+    
+    pages = walk(client, "/audit/", limit=3, sort_order=sort_order)
+    
+    by_time = [1, 3, 7, 5, 2, 6, 4]
+    assert ids(pages) == (by_time[::-1] if sort_order == "desc" else by_time)
+    assert [len(page["items"]) for page in pages] == [3, 3, 1]
+    assert wait_for_total(client, "/audit/", limit=3, sort_order=sort_order) == 7
+
+@pytest.mark.parametrize("sort_order", ["desc", "asc"])
+def test_equal_created_at_is_ordered_by_id(client, add_logs, sort_order):
+    add_logs(*(log(log_id, 0) for log_id in range(1, 6)), log(6, -1), log(7, 1))
+    
+    pages = walk(client, "/audit/", limit=2, sort_order=sort_order)
+    
+    ascending = [6, 1, 2, 3, 4, 5, 7]
+    assert ids(pages) == (ascending[::-1] if sort_order == "desc" else ascending)
+
+def test_filtered_page(client, add_logs):
+    add_logs(
+        log(1, 0, action_type="login"),
+        log(2, 1, action_type="logout"),
+        log(3, 2, action_type="login", resource_type="trace"),
+        log(4, 3, action_type="login"),
+        log(5, 4, action_type="login", user_id=2),
+        log(6, 5, action_type="login"),
+    )
+    
+    pages = walk(client, "/audit/action/login", limit=2, resource_type="user")
+    
+    assert ids(pages) == [6, 4, 1]
+    assert all(item["action_type"] == "login" for page in pages for item in page["items"])
+    # The cached totals cannot answer a resource filter
+    assert pages[0]["approx_total"] is None
+    
+    action_pages = walk(client, "/audit/action/login", limit=10)
+    assert ids(action_pages) == [6, 4, 3, 1]
+    assert wait_for_total(client, "/audit/action/login", limit=10) == 4
+
+def test_approx_total_is_served_stale_while_refreshing(client, add_logs, monkeypatch):
+    add_logs(log(1, 0), log(2, 1))
+    assert wait_for_total(client, "/audit/") == 2
+    
+    add_logs(log(3, 2))
+    assert client.get("/audit/").json()["approx_total"] == 2
+    
+    monkeypatch.setattr(audit_router.settings, "AUDIT_COUNT_REFRESH", 0)
+    assert client.get("/audit/").json()["approx_total"] == 2
+    for _ in range(50):
+        if client.get("/audit/").json()["approx_total"] == 3:
+            break
+        time.sleep(0.02)
+    assert client.get("/audit/").json()["approx_total"] == 3
+
+def test_cursor_encodes_position(client, add_logs):
+    add_logs(log(1, 0), log(2, 0), log(3, 0))
+    
+    first = client.get("/audit/", params={"limit": 1}).json()
+    created_at, log_id = audit_router._decode_cursor(first["next_cursor"])
+    
+    assert (created_at, log_id) == (BASE_TIME, 3)
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/audit/", params={"cursor": "not-a-cursor"})
+    
+    assert response.status_code == 400
+
+def test_sort_by_is_limited_to_keyset_columns(client, add_logs):
+    add_logs(log(1, 0), log(2, 1))
+    
+    assert ids([client.get("/audit/", params={"sort_by": "created_at"}).json()]) == [2, 1]
+    assert client.get("/audit/", params={"sort_by": "resource_type"}).status_code == 422
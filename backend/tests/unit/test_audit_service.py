@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from api.models.database import Base, AuditLog, User
+from api.services.audit import AuditService
+
+@pytest.fixture
+def db_session():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add(User(id=1, email="system@example.com", full_name="System"))
+    session.commit()
+    yield session
+    session.close()
+
+@pytest.fixture
+def audit_service(db_session):
+    return AuditService(db_session)
+
+def issue_entry(pattern):
+    return {
+        "action_type": "issue_detected",
+        "resource_type": "trace",
+        "meta_data": {"trace_id": 7, "pattern": pattern}
+    }
+
+@pytest.mark.asyncio
+async def test_batch_keeps_entries_with_distinct_meta_data(audit_service, db_session):
+    entries = [issue_entry(pattern) for pattern in ("ERROR", "Timeout", "Deadlock", "404")]
+    
+    audit_logs = await audit_service.log_system_actions(entries)
+    
+    assert len(audit_logs) == 4
+    assert db_session.query(AuditLog).count() == 4
+
+@pytest.mark.asyncio
+async def test_batch_skips_identical_entries(audit_service, db_session):
+    audit_logs = await audit_service.log_system_actions([issue_entry("ERROR"), issue_entry("ERROR")])
+    
+    assert len(audit_logs) == 1
+    assert db_session.query(AuditLog).count() == 1
+
+@pytest.mark.asyncio
+async def test_repeated_action_within_a_second_is_skipped(audit_service, db_session):
+    first = await audit_service.log_system_action("trace_analysis_start", "trace", {"trace_id": 7})
+    second = await audit_service.log_system_action("trace_analysis_start", "trace", {"trace_id": 7})
+    other = await audit_service.log_system_action("trace_analysis_start", "trace", {"trace_id": 8})
+    
+    assert first is not None
+    assert second is None
+    assert other is not None
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from api.models.database import Base, AuditLog
+from api.services import audit_writer as audit_writer_module
+from api.services.audit_writer import AuditWriter
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    path = tmp_path / "audit.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    
+    invalidated = []
+    
+    async def invalidate(user_id):
+        invalidated.append(user_id)
+    
+    monkeypatch.setattr(audit_writer_module.audit_cache, "invalidate", invalidate)
+    factory = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool))
+    factory.invalidated = invalidated
+    return factory
+
+def row(user_id=1, action_type="login"):
+    return {
+        "user_id": user_id,
+        "action_type": action_type,
+        "resource_type": "user",
+        "meta_data": {"user_id": user_id},
+        "created_at": datetime.utcnow()
+    }
+
+async def count_logs(session_factory):
+    async with session_factory() as db:
+        return await db.scalar(select(func.count()).select_from(AuditLog))
+
+async def wait_for_logs(session_factory, expected, timeout=2.0):
+    """Poll until expected rows are written, returning the last count seen."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        count = await count_logs(session_factory)
+        if count >= expected or loop.time() > deadline:
+            return count
+        await asyncio.sleep(0.01)
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_size_is_reached(session_factory):
+    writer = AuditWriter(batch_size=3, flush_interval=60, session_factory=session_factory)
+    writer.start()
+    try:
+        writer.submit([row(), row(), row()])
+        assert await wait_for_logs(session_factory, 3) == 3
+        
+        # One row short of a batch waits for the flush interval
+        writer.submit([row()])
+        await asyncio.sleep(0.1)
+        assert await count_logs(session_factory) == 3
+    finally:
+        await writer.stop()
+    
+    assert await count_logs(session_factory) == 4
+    assert set(session_factory.invalidated) == {1}
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval(session_factory):
+    writer = AuditWriter(batch_size=100, flush_interval=0.05, session_factory=session_factory)
+    writer.start()
+    try:
+        writer.submit([row(), row()])
+        assert await wait_for_logs(session_factory, 2) == 2
+    finally:
+        await writer.stop()
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_rows(session_factory):
+    writer = AuditWriter(batch_size=100, flush_interval=60, session_factory=session_factory)
+    writer.start()
+    writer.submit([row(user_id=user_id) for user_id in (1, 2, 2, 3, 3)])
+    
+    await writer.stop()
+    
+    assert await count_logs(session_factory) == 5
+    assert not writer.running
+    assert set(session_factory.invalidated) == {1, 2, 3}
@@ -0,0 +1,119 @@
+import re
+
+import pytest
+from api.agents import rca_agent
+from api.agents.rca_agent import RCAAgent
+
+# Step texts run through every error and correlation back end
+TRACE_TEXTS = [
+    "all fine\nnothing to see here",
+    "ERROR: Connection refused at db\nTimeout calling payments\nline3",
+    "Deadlock detected\nthrottling upstream, status 429\nRateLimitExceeded",
+    "OUT OF MEMORY\nMemoryLeak detected 404 caused by foo at x.py:12",
+    "Permission denied for user \u00e9mile within 5 ms\nAccessDenied: 403 / 503 / 502",
+    "slow response: latency 1200ms while invoking billing; CPU and Memory high",
+    "ValidationError: schema mismatch\nFormat error in invalid input\nwarning",
+]
+
+@pytest.fixture
+def agent():
+    return RCAAgent()
+
+def detected_patterns(agent, text):
+    return {issue["pattern"] for issue in agent._detect_error_patterns(text.encode())}
+
+def test_overlapping_rules_both_fire_on_deadlock(agent):
+    patterns = detected_patterns(agent, "Deadlock detected in worker pool")
+    
+    assert "Deadlock|Race condition|Thread starvation" in patterns
+    assert "Deadlock|RaceCondition|ThreadStarvation" in patterns
+
+def test_overlapping_rules_both_fire_on_throttling(agent):
+    patterns = detected_patterns(agent, "Throttling requests from client")
+    
+    assert "Rate limit exceeded|Throttling|429" in patterns
+    assert "CircuitBreakerOpen|RateLimitExceeded|Throttling" in patterns
+
+def test_rule_hits_are_counted_per_rule(agent):
+    issues = {
+        issue["pattern"]: issue
+        for issue in agent._detect_error_patterns(b"Deadlock\nok\ndeadlock again")
+    }
+    
+    assert issues["Deadlock|Race condition|Thread starvation"]["count"] == 2
+    assert issues["Deadlock|RaceCondition|ThreadStarvation"]["count"] == 2
+    assert issues["Deadlock|RaceCondition|ThreadStarvation"]["line_number"] == 1
+
+def per_rule_reference(text):
+    """Hit count per pattern from scanning each rule separately, as the original per-rule loop did."""
+    counts = {}
+    for rule in rca_agent._RULES["error_patterns"]:
+        hits = len(re.findall(rule["pattern"].encode(), text.encode(), re.IGNORECASE))
+        if hits:
+            counts[rule["pattern"]] = hits
+    return counts
+
+def use_error_backend(agent, backend):
+    """Point agent at one error-scanning back end, skipping when its module is missing."""
+    rules = list(rca_agent._ERROR_RULES.values())
+    agent._hs_error_db = None
+    agent._error_prescreen = None
+    if backend == "re":
+        agent._error_literals = None
+        agent._fused_error_re = rca_agent._fuse_patterns(rca_agent._ERROR_RULES)
+        return
+    if backend == "hyperscan":
+        pytest.importorskip("hyperscan")
+        agent._error_literals = None
+        agent._hs_error_db = rca_agent._build_hyperscan_db(rules)
+        return
+    agent._error_literals = rca_agent._literal_alternatives(rules)
+    agent._fused_error_re = rca_agent._fuse_patterns(rca_agent._ERROR_RULES, lowercase=True)
+    if backend == "ahocorasick":
+        pytest.importorskip("ahocorasick")
+        agent._error_prescreen = rca_agent._build_literal_prescreen(agent._error_literals)
+
+def comparable(issues):
+    return sorted(
+        (issue["pattern"], issue["count"], issue["line_number"], issue["context"])
+        for issue in issues
+    )
+
+@pytest.mark.parametrize("backend", ["re", "re-lowercase", "ahocorasick", "hyperscan"])
+@pytest.mark.parametrize("text", TRACE_TEXTS)
+def test_error_backends_agree(agent, backend, text):
+    use_error_backend(agent, "re")
+    expected = agent._detect_error_patterns(text.encode())
+    use_error_backend(agent, backend)
+    issues = agent._detect_error_patterns(text.encode())
+    
+    assert comparable(issues) == comparable(expected)
+    assert {issue["pattern"]: issue["count"] for issue in issues} == per_rule_reference(text)
+
+@pytest.mark.parametrize("text", TRACE_TEXTS)
+def test_correlation_backends_agree(agent, text):
+    re2 = pytest.importorskip("re2")
+    rules = rca_agent._RULES["correlation_rules"].items()
+    
+    agent._correlation_rules = tuple(
+        (name, re.compile(rule["pattern"].encode(), re.IGNORECASE), rule) for name, rule in rules
+    )
+    expected = agent._apply_correlation_rules(text.encode(), "t")
+    agent._correlation_rules = tuple(
+        (name, re2.compile(b"(?i)" + rule["pattern"].encode()), rule) for name, rule in rules
+    )
+    
+    assert agent._apply_correlation_rules(text.encode(), "t") == expected
+
+def test_trend_issue_reports_baseline_values(agent):
+    assert agent._analyze_performance_metrics({"response_time": 100}, "t") == []
+    
+    issues = agent._analyze_performance_metrics({"response_time": 200}, "t")
+    
+    trend = next(issue for issue in issues if issue["type"] == "performance_trend")
+    assert trend["trend"] == 1.0
+    assert trend["baseline"]["values"] == [100]
+    assert set(trend["baseline"]) == {"values", "last_update"}
+    # Later updates don't leak into an issue already reported
+    agent._analyze_performance_metrics({"response_time": 300}, "t")
+    assert trend["baseline"]["values"] == [100]
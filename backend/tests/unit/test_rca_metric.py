@@ -0,0 +1,65 @@
+import pytest
+
+pytest.importorskip("deepeval")
+
+from deepeval.test_case import LLMTestCase
+from api.evaluation.deepeval import RCAMetric
+
+def reference_f1(actual_issues, expected_issues):
+    """F1 from precision and recall, as RCAMetric computed it before the 2tp / (a + e) form."""
+    true_positives = len(set(actual_issues) & set(expected_issues))
+    precision = true_positives / len(actual_issues) if actual_issues else 0
+    recall = true_positives / len(expected_issues) if expected_issues else 0
+    if precision + recall > 0:
+        return 2 * (precision * recall) / (precision + recall)
+    return 0
+
+def measure(actual_issues, expected_issues):
+    test_case = LLMTestCase(
+        input="trace",
+        actual_output={"issues": actual_issues},
+        expected_output={"issues": expected_issues}
+    )
+    return RCAMetric().measure(test_case)
+
+@pytest.mark.parametrize(
+    "actual_issues, expected_issues, expected_score",
+    [
+        ([], [], 0),
+        ([], ["timeout"], 0),
+        (["timeout"], [], 0),
+        (["timeout", "oom"], ["deadlock", "404"], 0),
+        (["timeout", "oom"], ["timeout", "oom"], 1.0),
+        (["timeout", "oom"], ["oom", "timeout"], 1.0),
+        (["timeout", "oom", "404"], ["oom", "404", "deadlock", "503"], 4 / 7),
+        (["timeout"], ["timeout", "oom", "404"], 0.5),
+        (["timeout", "timeout", "oom"], ["timeout"], 0.5),
+    ],
+    ids=[
+        "both-empty",
+        "actual-empty",
+        "expected-empty",
+        "disjoint",
+        "identical",
+        "identical-reordered",
+        "partial-overlap",
+        "subset",
+        "duplicate-actual",
+    ]
+)
+def test_score_matches_precision_recall_f1(actual_issues, expected_issues, expected_score):
+    score = measure(actual_issues, expected_issues)
+    
+    assert score == pytest.approx(expected_score)
+    assert score == pytest.approx(reference_f1(actual_issues, expected_issues))
+
+def test_frozensets_score_like_lists():
+    actual_issues = ["timeout", "oom", "404"]
+    expected_issues = ["oom", "404", "deadlock", "503"]
+    
+    assert measure(frozenset(actual_issues), frozenset(expected_issues)) == measure(actual_issues, expected_issues)
+
+def test_missing_issues_score_zero():
+    test_case = LLMTestCase(input="trace", actual_output={}, expected_output={"issues": ["timeout"]})
+    
+    assert RCAMetric().measure(test_case) == 0
@@ -82,7 +82,7 @@ export default function Audit() {
       }
 
       // Ensure we're working with an array of logs
-      const logs = Array.isArray(response.data) ? response.data : [];
+      const logs = Array.isArray(response.data?.items) ? response.data.items : [];
       setAuditLogs(logs);
     } catch (err) {
       console.error('Error fetching audit logs:', err);
@@ -196,16 +196,12 @@ export default function Dashboard() {
   useEffect(() => {
     const fetchDashboardData = async () => {
       try {
-        // Fetch dashboard data from API
-        const [statsResponse, activitiesResponse, healthResponse] = await Promise.all([
-          api.get('/dashboard/stats'),
-          api.get('/dashboard/activities'),
-          api.get('/dashboard/health'),
-        ]);
+        // Fetch dashboard data from API in a single request
+        const response = await api.get('/dashboard/bootstrap');
 
-        setStats(statsResponse.data);
-        setActivities(activitiesResponse.data);
-        setHealthData(healthResponse.data);
+        setStats(response.data.stats);
+        setActivities(response.data.activities);
+        setHealthData(response.data.health);
       } catch (error) {
         console.error('Error fetching dashboard data:', error);
       } finally {